@@ -1,6 +1,34 @@
 # CircuitPython Library specifically for the TOFSense F2 sensor.
 # This version is simplified to remove support for other models.
 
+import struct
+
+try:
+    # Only used for batch validation on host-side collectors; not available on the board
+    import numpy as np
+except ImportError:
+    np = None
+
+_FRAME_LENGTH = 16
+# Every data frame starts with the frame header and mark bytes
+_FRAME_HEADER = 0x57
+_FRAME_MARK = 0x00
+# Frame fields from byte 3: id, system_time, dis (low 3 bytes) + dis_status (high byte),
+# signal_strength, range_precision. All little-endian.
+_FRAME_FORMAT = "<BIIHB"
+_FRAME_FIELDS_OFFSET = 3
+
+def _parse_frame(frame):
+    """
+    Decodes the numeric fields of a data frame.
+    :param frame: The 16-byte data frame.
+    :return: A tuple of (id, system_time, dis_mm, dis_status, signal_strength, range_precision).
+    """
+    sensor_id, system_time, dis_word, signal_strength, range_precision = struct.unpack_from(
+        _FRAME_FORMAT, frame, _FRAME_FIELDS_OFFSET
+    )
+    return sensor_id, system_time, dis_word & 0xFFFFFF, dis_word >> 24, signal_strength, range_precision
+
 class TOFSenseF2:
     """
     A dedicated driver for the TOFSense F2 distance sensor.
@@ -12,74 +40,108 @@ class TOFSenseF2:
         :param uart: An initialized busio.UART object.
         """
         # Protocol constants specific to the TOFSense F2
-        self._FRAME_HEADER = 0x57
-        self._FRAME_MARK = 0x00
-        self._DATA_LENGTH = 16
+        self._FRAME_HEADER = _FRAME_HEADER
+        self._FRAME_MARK = _FRAME_MARK
+        self._DATA_LENGTH = _FRAME_LENGTH
+        self._FRAME_SYNC = bytes((self._FRAME_HEADER, self._FRAME_MARK))
+        self._RX_BUF_SIZE = 64
         
         self.uart = uart
+        # Preallocated receive buffer: _rx_len bytes are valid, _rx_idx is the read cursor
+        self._rx_buf = bytearray(self._RX_BUF_SIZE)
+        self._rx_mv = memoryview(self._rx_buf)
+        self._rx_len = 0
+        self._rx_idx = 0
+        # The last frame read. Reused for every frame, so it is only valid until the next read.
+        self._frame = bytearray(self._DATA_LENGTH)
+        # Query frame template; only the sensor id (byte 4) and checksum (byte 7) change per call
+        self._query_frame = bytearray(b"\x57\x10\xFF\xFF\x00\xFF\xFF\x00")
+        self._query_fixed_sum = sum(self._query_frame) & 0xFF
         self.data_dict = {
             "id": 0,
             "system_time": 0,
             "dis": 0.0,
+            "dis_mm": 0,
             "dis_status": 0,
             "signal_strength": 0,
             "range_precision": 0,
         }
 
-    def _read_byte(self):
-        """Reads a single byte from the UART bus."""
-        byte = self.uart.read(1)
-        return byte[0] if byte is not None else None
+    def _ensure(self, n, block=True):
+        """
+        Tops up the receive buffer until at least n unread bytes are available.
+        Reads everything the UART already holds in one call rather than byte by byte.
+        :param n: The number of unread bytes required.
+        :param block: If False, only read bytes the UART has already received.
+        :return: True if enough bytes are buffered, False on a UART timeout or,
+                 when not blocking, if the bytes have not arrived yet.
+        """
+        while self._rx_len - self._rx_idx < n:
+            needed = n - (self._rx_len - self._rx_idx)
+            if self._rx_len + needed > self._RX_BUF_SIZE:
+                self._compact()
+            free = self._RX_BUF_SIZE - self._rx_len
+            waiting = self.uart.in_waiting
+            if block:
+                want = max(needed, min(waiting, free))
+            elif waiting:
+                want = min(waiting, free)
+            else:
+                return False
+            count = self.uart.readinto(self._rx_mv[self._rx_len:self._rx_len + want])
+            if not count: # Timeout
+                return False
+            self._rx_len += count
+        return True
+
+    def _compact(self):
+        """Moves the unread bytes to the front of the receive buffer."""
+        unread = self._rx_len - self._rx_idx
+        if self._rx_idx and unread:
+            self._rx_buf[:unread] = self._rx_mv[self._rx_idx:self._rx_len]
+        self._rx_len = unread
+        self._rx_idx = 0
 
-    def _get_data_frame(self):
+    def _get_data_frame(self, block=True):
         """
         Reads a complete data frame from the UART bus.
+        :param block: If False, return None instead of waiting for bytes still in flight.
+        :return: The frame buffer, valid until the next read, or None on a timeout.
         """
         if self.uart is None:
             return None
 
-        # Continuously look for the frame header
+        # Continuously look for the frame header and mark in the buffered bytes
         while True:
-            header_byte = self._read_byte()
-            if header_byte is None: # Timeout
-                return None
-            if header_byte == self._FRAME_HEADER:
-                # Header found, now look for the frame mark
-                mark_byte = self._read_byte()
-                if mark_byte == self._FRAME_MARK:
-                    # Mark found, read the rest of the data payload
-                    payload_len = self._DATA_LENGTH - 2
-                    payload = self.uart.read(payload_len)
-                    if payload and len(payload) == payload_len:
-                        # Construct and return the full frame
-                        full_frame = bytearray([self._FRAME_HEADER, self._FRAME_MARK])
-                        full_frame.extend(payload)
-                        return full_frame
-                # If mark is not found, continue searching for the next header
-        return None
-
-    def _check_data(self, data):
-        """
-        Validates a data frame using a checksum.
-        :param data: The bytearray data frame to check.
-        :return: A list of hex values if valid, otherwise False.
-        """
-        if data is None or not isinstance(data, (bytes, bytearray)):
-            return False
+            idx = self._rx_buf.find(self._FRAME_SYNC, self._rx_idx, self._rx_len)
+            if idx < 0:
+                # No header pair buffered yet. Keep the last byte, it may be a
+                # header whose mark has not arrived.
+                self._rx_idx = max(self._rx_idx, self._rx_len - 1)
+                if not self._ensure(self._DATA_LENGTH, block):
+                    return None
+                continue
 
-        # Extract data payload and the original checksum
-        data_payload = data[:-1]
-        original_checksum = data[-1]
+            # Header and mark found, make sure the rest of the payload is buffered.
+            # Topping up may compact the buffer, so take the frame from the cursor.
+            self._rx_idx = idx
+            if not self._ensure(self._DATA_LENGTH, block):
+                return None
+            start = self._rx_idx
+            candidate = self._rx_mv[start:start + self._DATA_LENGTH]
 
-        # Calculate the expected checksum
-        calculated_checksum = sum(data_payload) & 0xFF
+            # Validate the checksum before accepting the frame. On a mismatch the header was
+            # noise or the frame was damaged, so resume the scan one byte later rather than
+            # dropping the whole span, which may hold the real header.
+            calculated_checksum = sum(candidate[:-1]) & 0xFF
+            if calculated_checksum != candidate[-1]:
+                print(f"Checksum mismatch: Got {candidate[-1]}, calculated {calculated_checksum}")
+                self._rx_idx = start + 1
+                continue
 
-        if calculated_checksum != original_checksum:
-            print(f"Checksum mismatch: Got {original_checksum}, calculated {calculated_checksum}")
-            return False
-        
-        # Convert to a list of hex strings for easier parsing
-        return [f"{byte:02x}" for byte in data]
+            self._frame[:] = candidate
+            self._rx_idx = start + self._DATA_LENGTH
+            return self._frame
 
     def _send_read_frame(self, sensor_id):
         """
@@ -89,13 +151,10 @@ class TOFSenseF2:
         if self.uart is None:
             return
         try:
-            # Protocol data for the query frame
-            protocol_data = [0x57, 0x10, 0xFF, 0xFF, sensor_id, 0xFF, 0xFF]
-            # Calculate and append the checksum
-            checksum = sum(protocol_data) & 0xFF
-            protocol_data.append(checksum)
-            # Convert to bytes and send over UART
-            self.uart.write(bytes(protocol_data))
+            # Fill in the sensor id and its checksum, then send over UART
+            self._query_frame[4] = sensor_id
+            self._query_frame[7] = (self._query_fixed_sum + sensor_id) & 0xFF
+            self.uart.write(self._query_frame)
             return True
         except Exception as e:
             print(f"An exception occurred while sending data: {e}")
@@ -111,6 +170,42 @@ class TOFSenseF2:
             return self.__unpack_data(raw_data)
         return None
 
+    @classmethod
+    def validate_batch(cls, frames):
+        """
+        Checks a batch of back-to-back data frames in one pass, for collectors that
+        gather frames from many sensors before parsing them. A frame is valid when it
+        starts with the header and mark bytes and its checksum matches, the same test
+        _get_data_frame() applies.
+        :param frames: A bytes-like object holding N complete frames.
+        :return: A list with one boolean per frame, True where the frame is valid.
+        """
+        if len(frames) % _FRAME_LENGTH:
+            raise ValueError("Batch length must be a multiple of the frame length.")
+        if np is not None:
+            rows = np.frombuffer(frames, dtype=np.uint8).reshape(-1, _FRAME_LENGTH)
+            sums = np.add.reduce(rows[:, :-1], axis=1, dtype=np.uint32) & 0xFF
+            valid = (rows[:, 0] == _FRAME_HEADER) & (rows[:, 1] == _FRAME_MARK) & (sums == rows[:, -1])
+            return valid.tolist()
+        mv = memoryview(frames)
+        return [
+            mv[i] == _FRAME_HEADER and mv[i + 1] == _FRAME_MARK
+            and sum(mv[i:i + _FRAME_LENGTH - 1]) & 0xFF == mv[i + _FRAME_LENGTH - 1]
+            for i in range(0, len(frames), _FRAME_LENGTH)
+        ]
+
+    def poll_data(self):
+        """
+        Parses a frame from the sensor in active output mode only if it has
+        already arrived, so the caller never waits on the UART timeout.
+        Partial frames stay buffered for the next call.
+        :return: A dictionary with parsed data, or None if no complete frame is available.
+        """
+        raw_data = self._get_data_frame(block=False)
+        if raw_data:
+            return self.__unpack_data(raw_data)
+        return None
+
     def get_data_inquire(self, sensor_id=0):
         """
         Gets and parses data from the sensor in query mode.
@@ -126,21 +221,19 @@ class TOFSenseF2:
     def __unpack_data(self, data):
         """
         Parses a raw data frame into the data_dict.
-        :param data: The raw bytearray data frame.
+        :param data: The raw bytearray data frame, already checksum-validated.
         """
-        hex_list = self._check_data(data)
-        if not hex_list:
-            return None
-
         try:
             # Parse data fields according to the TOFSense protocol
-            self.data_dict["id"] = int(hex_list[3], 16)
-            self.data_dict["system_time"] = int(hex_list[7] + hex_list[6] + hex_list[5] + hex_list[4], 16)
-            # Distance is a 3-byte little-endian value in mm, convert to meters
-            self.data_dict["dis"] = int(hex_list[10] + hex_list[9] + hex_list[8], 16) / 1000.0
-            self.data_dict["dis_status"] = int(hex_list[11], 16)
-            self.data_dict["signal_strength"] = int(hex_list[13] + hex_list[12], 16)
-            self.data_dict["range_precision"] = int(hex_list[14], 16)
+            sensor_id, system_time, dis_mm, dis_status, signal_strength, range_precision = _parse_frame(data)
+            self.data_dict["id"] = sensor_id
+            self.data_dict["system_time"] = system_time
+            self.data_dict["dis_status"] = dis_status
+            self.data_dict["signal_strength"] = signal_strength
+            self.data_dict["range_precision"] = range_precision
+            # Distance is a 3-byte little-endian value in mm, also provided in meters
+            self.data_dict["dis_mm"] = dis_mm
+            self.data_dict["dis"] = dis_mm / 1000.0
             return self.data_dict
         except (ValueError, IndexError) as e:
             print(f"Error parsing data: {e}")
@@ -44,6 +44,7 @@ _RANGE_CONFIG__VCSEL_PERIOD_A = const(0x0060)
 _RANGE_CONFIG__TIMEOUT_MACROP_B_HI = const(0x0061)
 _RANGE_CONFIG__VCSEL_PERIOD_B = const(0x0063)
 _RANGE_CONFIG__VALID_PHASE_HIGH = const(0x0069)
+_SYSTEM__INTERMEASUREMENT_PERIOD = const(0x006C)
 _SD_CONFIG__WOI_SD0 = const(0x0078)
 _SD_CONFIG__INITIAL_PHASE_SD0 = const(0x007A)
 _ROI_CONFIG__USER_ROI_CENTRE_SPAD = const(0x007F)
@@ -52,29 +53,165 @@ _SYSTEM__INTERRUPT_CLEAR = const(0x0086)
 _SYSTEM__MODE_START = const(0x0087)
 _VL53L1X_RESULT__RANGE_STATUS = const(0x0089)
 _VL53L1X_RESULT__FINAL_CROSSTALK_CORRECTED_RANGE_MM_SD0 = const(0x0096)
+_VL53L1X_RESULT__OSC_CALIBRATE_VAL = const(0x00DE)
 _VL53L1X_IDENTIFICATION__MODEL_ID = const(0x010F)
 
-TB_SHORT_DIST = {
-    # ms: (MACROP_A_HI, MACROP_B_HI)
-    15: (b"\x00\x1D", b"\x00\x27"),
-    20: (b"\x00\x51", b"\x00\x6E"),
-    33: (b"\x00\xD6", b"\x00\x6E"),
-    50: (b"\x01\xAE", b"\x01\xE8"),
-    100: (b"\x02\xE1", b"\x03\x88"),
-    200: (b"\x03\xE1", b"\x04\x96"),
-    500: (b"\x05\x91", b"\x05\xC1"),
+_BUDGET_IDX = {15: 0, 20: 1, 33: 2, 50: 3, 100: 4, 200: 5, 500: 6}
+
+TB_SHORT_DIST = (
+    # MACROP_A_HI/LO + VCSEL_PERIOD_A + MACROP_B_HI/LO, one block from 0x5E,
+    # indexed by _BUDGET_IDX
+    b"\x00\x1D\x07\x00\x27",  # 15 ms
+    b"\x00\x51\x07\x00\x6E",  # 20 ms
+    b"\x00\xD6\x07\x00\x6E",  # 33 ms
+    b"\x01\xAE\x07\x01\xE8",  # 50 ms
+    b"\x02\xE1\x07\x03\x88",  # 100 ms
+    b"\x03\xE1\x07\x04\x96",  # 200 ms
+    b"\x05\x91\x07\x05\xC1",  # 500 ms
+)
+
+TB_LONG_DIST = (
+    # MACROP_A_HI/LO + VCSEL_PERIOD_A + MACROP_B_HI/LO, one block from 0x5E,
+    # indexed by _BUDGET_IDX
+    None,  # 15 ms: short mode only
+    b"\x00\x1E\x0F\x00\x22",  # 20 ms
+    b"\x00\x60\x0F\x00\x6E",  # 33 ms
+    b"\x00\xAD\x0F\x00\xC6",  # 50 ms
+    b"\x01\xCC\x0F\x01\xEA",  # 100 ms
+    b"\x02\xD9\x0F\x02\xF8",  # 200 ms
+    b"\x04\x8F\x0F\x04\xA4",  # 500 ms
+)
+
+# pylint: disable=line-too-long
+# Default configuration written from 0x2D at init
+_INIT_SEQ = bytes(
+    [  # value    addr : description
+        0x00,  # 0x2d : set bit 2 and 5 to 1 for fast plus mode (1MHz I2C), else don't touch
+        0x00,  # 0x2e : bit 0 if I2C pulled up at 1.8V, else set bit 0 to 1 (pull up at AVDD)
+        0x00,  # 0x2f : bit 0 if GPIO pulled up at 1.8V, else set bit 0 to 1 (pull up at AVDD)
+        0x01,  # 0x30 : set bit 4 to 0 for active high interrupt and 1 for active low (bits 3:0 must be 0x1), use SetInterruptPolarity()
+        0x02,  # 0x31 : bit 1 = interrupt depending on the polarity
+        0x00,  # 0x32 : not user-modifiable
+        0x02,  # 0x33 : not user-modifiable
+        0x08,  # 0x34 : not user-modifiable
+        0x00,  # 0x35 : not user-modifiable
+        0x08,  # 0x36 : not user-modifiable
+        0x10,  # 0x37 : not user-modifiable
+        0x01,  # 0x38 : not user-modifiable
+        0x01,  # 0x39 : not user-modifiable
+        0x00,  # 0x3a : not user-modifiable
+        0x00,  # 0x3b : not user-modifiable
+        0x00,  # 0x3c : not user-modifiable
+        0x00,  # 0x3d : not user-modifiable
+        0xFF,  # 0x3e : not user-modifiable
+        0x00,  # 0x3f : not user-modifiable
+        0x0F,  # 0x40 : not user-modifiable
+        0x00,  # 0x41 : not user-modifiable
+        0x00,  # 0x42 : not user-modifiable
+        0x00,  # 0x43 : not user-modifiable
+        0x00,  # 0x44 : not user-modifiable
+        0x00,  # 0x45 : not user-modifiable
+        0x20,  # 0x46 : interrupt configuration 0->level low detection, 1-> level high, 2-> Out of window, 3->In window, 0x20-> New sample ready , TBC
+        0x0B,  # 0x47 : not user-modifiable
+        0x00,  # 0x48 : not user-modifiable
+        0x00,  # 0x49 : not user-modifiable
+        0x02,  # 0x4a : not user-modifiable
+        0x0A,  # 0x4b : not user-modifiable
+        0x21,  # 0x4c : not user-modifiable
+        0x00,  # 0x4d : not user-modifiable
+        0x00,  # 0x4e : not user-modifiable
+        0x05,  # 0x4f : not user-modifiable
+        0x00,  # 0x50 : not user-modifiable
+        0x00,  # 0x51 : not user-modifiable
+        0x00,  # 0x52 : not user-modifiable
+        0x00,  # 0x53 : not user-modifiable
+        0xC8,  # 0x54 : not user-modifiable
+        0x00,  # 0x55 : not user-modifiable
+        0x00,  # 0x56 : not user-modifiable
+        0x38,  # 0x57 : not user-modifiable
+        0xFF,  # 0x58 : not user-modifiable
+        0x01,  # 0x59 : not user-modifiable
+        0x00,  # 0x5a : not user-modifiable
+        0x08,  # 0x5b : not user-modifiable
+        0x00,  # 0x5c : not user-modifiable
+        0x00,  # 0x5d : not user-modifiable
+        0x01,  # 0x5e : not user-modifiable
+        0xCC,  # 0x5f : not user-modifiable
+        0x0F,  # 0x60 : not user-modifiable
+        0x01,  # 0x61 : not user-modifiable
+        0xF1,  # 0x62 : not user-modifiable
+        0x0D,  # 0x63 : not user-modifiable
+        0x01,  # 0x64 : Sigma threshold MSB (mm in 14.2 format for MSB+LSB), default value 90 mm
+        0x68,  # 0x65 : Sigma threshold LSB
+        0x00,  # 0x66 : Min count Rate MSB (MCPS in 9.7 format for MSB+LSB)
+        0x80,  # 0x67 : Min count Rate LSB
+        0x08,  # 0x68 : not user-modifiable
+        0xB8,  # 0x69 : not user-modifiable
+        0x00,  # 0x6a : not user-modifiable
+        0x00,  # 0x6b : not user-modifiable
+        0x00,  # 0x6c : Intermeasurement period MSB, 32 bits register
+        0x00,  # 0x6d : Intermeasurement period
+        0x0F,  # 0x6e : Intermeasurement period
+        0x89,  # 0x6f : Intermeasurement period LSB
+        0x00,  # 0x70 : not user-modifiable
+        0x00,  # 0x71 : not user-modifiable
+        0x00,  # 0x72 : distance threshold high MSB (in mm, MSB+LSB)
+        0x00,  # 0x73 : distance threshold high LSB
+        0x00,  # 0x74 : distance threshold low MSB ( in mm, MSB+LSB)
+        0x00,  # 0x75 : distance threshold low LSB
+        0x00,  # 0x76 : not user-modifiable
+        0x01,  # 0x77 : not user-modifiable
+        0x0F,  # 0x78 : not user-modifiable
+        0x0D,  # 0x79 : not user-modifiable
+        0x0E,  # 0x7a : not user-modifiable
+        0x0E,  # 0x7b : not user-modifiable
+        0x00,  # 0x7c : not user-modifiable
+        0x00,  # 0x7d : not user-modifiable
+        0x02,  # 0x7e : not user-modifiable
+        0xC7,  # 0x7f : ROI center
+        0xFF,  # 0x80 : XY ROI (X=Width, Y=Height)
+        0x9B,  # 0x81 : not user-modifiable
+        0x00,  # 0x82 : not user-modifiable
+        0x00,  # 0x83 : not user-modifiable
+        0x00,  # 0x84 : not user-modifiable
+        0x01,  # 0x85 : not user-modifiable
+        0x00,  # 0x86 : clear interrupt, 0x01=clear
+        0x00,  # 0x87 : ranging, 0x00=stop, 0x40=start
+    ]
+)
+# pylint: enable=line-too-long
+
+# The writes below are complete I2C payloads (16-bit register address followed
+# by the data), sent as-is so the per-sample and mode-switch writes don't copy
+# anything into the shared write buffer.
+
+_DIST_MODE_CMDS = {
+    # mode: (PHASECAL_CONFIG__TIMEOUT_MACROP, WOI_SD0 + INITIAL_PHASE_SD0)
+    1: (b"\x00\x4B\x14", b"\x00\x78\x07\x05\x06\x06"),
+    2: (b"\x00\x4B\x0A", b"\x00\x78\x0F\x0D\x0E\x0E"),
 }
 
-TB_LONG_DIST = {
-    # ms: (MACROP_A_HI, MACROP_B_HI)
-    20: (b"\x00\x1E", b"\x00\x22"),
-    33: (b"\x00\x60", b"\x00\x6E"),
-    50: (b"\x00\xAD", b"\x00\xC6"),
-    100: (b"\x01\xCC", b"\x01\xEA"),
-    200: (b"\x02\xD9", b"\x02\xF8"),
-    500: (b"\x04\x8F", b"\x04\xA4"),
+# One block from 0x5E to VALID_PHASE_HIGH (0x69) for each mode, indexed by
+# _BUDGET_IDX: the TB_*_DIST timing block (which includes VCSEL_PERIOD_A),
+# VCSEL_PERIOD_B, the sigma / min count rate thresholds and 0x68 at their
+# init values, then VALID_PHASE_HIGH. Writing the thresholds back unchanged
+# saves a separate transaction for VALID_PHASE_HIGH.
+_MODE_SWITCH_FIXED = _INIT_SEQ[0x64 - 0x2D : 0x69 - 0x2D]
+_MODE_TIMING_CMDS = {
+    1: tuple(
+        None if tb is None else b"\x00\x5E" + tb + b"\x05" + _MODE_SWITCH_FIXED + b"\x38"
+        for tb in TB_SHORT_DIST
+    ),
+    2: tuple(
+        None if tb is None else b"\x00\x5E" + tb + b"\x0D" + _MODE_SWITCH_FIXED + b"\xB8"
+        for tb in TB_LONG_DIST
+    ),
 }
 
+_CLEAR_INTERRUPT_CMD = b"\x00\x86\x01"
+_START_RANGING_CMD = b"\x00\x87\x40"
+_STOP_RANGING_CMD = b"\x00\x87\x00"
+
 
 class VL53L1X:
     """Driver for the VL53L1X distance sensor."""
@@ -82,114 +219,33 @@ class VL53L1X:
     def __init__(self, i2c, address=41):
         self.i2c_device = i2c_device.I2CDevice(i2c, address)
         self._i2c = i2c
+        # Reused for every register access so no per-call address packing is needed
+        self._addr_buf = bytearray(2)
+        self._write_buf = bytearray(18)
+        # Range status through final range, read as one block per sample
+        self._result_buf = bytearray(
+            _VL53L1X_RESULT__FINAL_CROSSTALK_CORRECTED_RANGE_MM_SD0
+            - _VL53L1X_RESULT__RANGE_STATUS
+            + 2
+        )
         model_id, module_type, mask_rev = self.model_info
         if model_id != 0xEA or module_type != 0xCC or mask_rev != 0x10:
             raise RuntimeError("Wrong sensor ID or type!")
         self._sensor_init()
+        # Only changed through the setters, so cache them instead of reading them back over I2C
+        self._distance_mode_cache = self._read_distance_mode
         self._timing_budget = None
         self.timing_budget = 50
 
     def _sensor_init(self):
-        # pylint: disable=line-too-long
-        init_seq = bytes(
-            [  # value    addr : description
-                0x00,  # 0x2d : set bit 2 and 5 to 1 for fast plus mode (1MHz I2C), else don't touch
-                0x00,  # 0x2e : bit 0 if I2C pulled up at 1.8V, else set bit 0 to 1 (pull up at AVDD)
-                0x00,  # 0x2f : bit 0 if GPIO pulled up at 1.8V, else set bit 0 to 1 (pull up at AVDD)
-                0x01,  # 0x30 : set bit 4 to 0 for active high interrupt and 1 for active low (bits 3:0 must be 0x1), use SetInterruptPolarity()
-                0x02,  # 0x31 : bit 1 = interrupt depending on the polarity
-                0x00,  # 0x32 : not user-modifiable
-                0x02,  # 0x33 : not user-modifiable
-                0x08,  # 0x34 : not user-modifiable
-                0x00,  # 0x35 : not user-modifiable
-                0x08,  # 0x36 : not user-modifiable
-                0x10,  # 0x37 : not user-modifiable
-                0x01,  # 0x38 : not user-modifiable
-                0x01,  # 0x39 : not user-modifiable
-                0x00,  # 0x3a : not user-modifiable
-                0x00,  # 0x3b : not user-modifiable
-                0x00,  # 0x3c : not user-modifiable
-                0x00,  # 0x3d : not user-modifiable
-                0xFF,  # 0x3e : not user-modifiable
-                0x00,  # 0x3f : not user-modifiable
-                0x0F,  # 0x40 : not user-modifiable
-                0x00,  # 0x41 : not user-modifiable
-                0x00,  # 0x42 : not user-modifiable
-                0x00,  # 0x43 : not user-modifiable
-                0x00,  # 0x44 : not user-modifiable
-                0x00,  # 0x45 : not user-modifiable
-                0x20,  # 0x46 : interrupt configuration 0->level low detection, 1-> level high, 2-> Out of window, 3->In window, 0x20-> New sample ready , TBC
-                0x0B,  # 0x47 : not user-modifiable
-                0x00,  # 0x48 : not user-modifiable
-                0x00,  # 0x49 : not user-modifiable
-                0x02,  # 0x4a : not user-modifiable
-                0x0A,  # 0x4b : not user-modifiable
-                0x21,  # 0x4c : not user-modifiable
-                0x00,  # 0x4d : not user-modifiable
-                0x00,  # 0x4e : not user-modifiable
-                0x05,  # 0x4f : not user-modifiable
-                0x00,  # 0x50 : not user-modifiable
-                0x00,  # 0x51 : not user-modifiable
-                0x00,  # 0x52 : not user-modifiable
-                0x00,  # 0x53 : not user-modifiable
-                0xC8,  # 0x54 : not user-modifiable
-                0x00,  # 0x55 : not user-modifiable
-                0x00,  # 0x56 : not user-modifiable
-                0x38,  # 0x57 : not user-modifiable
-                0xFF,  # 0x58 : not user-modifiable
-                0x01,  # 0x59 : not user-modifiable
-                0x00,  # 0x5a : not user-modifiable
-                0x08,  # 0x5b : not user-modifiable
-                0x00,  # 0x5c : not user-modifiable
-                0x00,  # 0x5d : not user-modifiable
-                0x01,  # 0x5e : not user-modifiable
-                0xCC,  # 0x5f : not user-modifiable
-                0x0F,  # 0x60 : not user-modifiable
-                0x01,  # 0x61 : not user-modifiable
-                0xF1,  # 0x62 : not user-modifiable
-                0x0D,  # 0x63 : not user-modifiable
-                0x01,  # 0x64 : Sigma threshold MSB (mm in 14.2 format for MSB+LSB), default value 90 mm
-                0x68,  # 0x65 : Sigma threshold LSB
-                0x00,  # 0x66 : Min count Rate MSB (MCPS in 9.7 format for MSB+LSB)
-                0x80,  # 0x67 : Min count Rate LSB
-                0x08,  # 0x68 : not user-modifiable
-                0xB8,  # 0x69 : not user-modifiable
-                0x00,  # 0x6a : not user-modifiable
-                0x00,  # 0x6b : not user-modifiable
-                0x00,  # 0x6c : Intermeasurement period MSB, 32 bits register
-                0x00,  # 0x6d : Intermeasurement period
-                0x0F,  # 0x6e : Intermeasurement period
-                0x89,  # 0x6f : Intermeasurement period LSB
-                0x00,  # 0x70 : not user-modifiable
-                0x00,  # 0x71 : not user-modifiable
-                0x00,  # 0x72 : distance threshold high MSB (in mm, MSB+LSB)
-                0x00,  # 0x73 : distance threshold high LSB
-                0x00,  # 0x74 : distance threshold low MSB ( in mm, MSB+LSB)
-                0x00,  # 0x75 : distance threshold low LSB
-                0x00,  # 0x76 : not user-modifiable
-                0x01,  # 0x77 : not user-modifiable
-                0x0F,  # 0x78 : not user-modifiable
-                0x0D,  # 0x79 : not user-modifiable
-                0x0E,  # 0x7a : not user-modifiable
-                0x0E,  # 0x7b : not user-modifiable
-                0x00,  # 0x7c : not user-modifiable
-                0x00,  # 0x7d : not user-modifiable
-                0x02,  # 0x7e : not user-modifiable
-                0xC7,  # 0x7f : ROI center
-                0xFF,  # 0x80 : XY ROI (X=Width, Y=Height)
-                0x9B,  # 0x81 : not user-modifiable
-                0x00,  # 0x82 : not user-modifiable
-                0x00,  # 0x83 : not user-modifiable
-                0x00,  # 0x84 : not user-modifiable
-                0x01,  # 0x85 : not user-modifiable
-                0x00,  # 0x86 : clear interrupt, 0x01=clear
-                0x00,  # 0x87 : ranging, 0x00=stop, 0x40=start
-            ]
-        )
-        self._write_register(0x002D, init_seq)
+        self._write_register(0x002D, _INIT_SEQ)
+        self._int_pol_cache = self._read_interrupt_polarity
         self.start_ranging()
+        # The first measurement takes at least 50ms; sleep through that in one go,
+        # then poll finely instead of re-checking every 10ms
+        time.sleep(0.05)
         while not self.data_ready:
-            time.sleep(0.01)
+            time.sleep(0.001)
         self.clear_interrupt()
         self.stop_ranging()
         self._write_register(_VL53L1X_VHV_CONFIG__TIMEOUT_MACROP_LOOP_BOUND, b"\x09")
@@ -204,32 +260,69 @@ class VL53L1X:
     @property
     def distance(self):
         """The distance in units of centimeters."""
+        dist = self.distance_mm
+        if dist is None:
+            return None
+        return dist / 10
+
+    @property
+    def distance_mm(self):
+        """The distance in units of millimeters, as an integer."""
         if self._read_register(_VL53L1X_RESULT__RANGE_STATUS)[0] != 0x09:
             return None
         dist = self._read_register(
             _VL53L1X_RESULT__FINAL_CROSSTALK_CORRECTED_RANGE_MM_SD0, 2
         )
-        dist = struct.unpack(">H", dist)[0]
+        return struct.unpack_from(">H", dist)[0]
+
+    def read_range_and_status(self):
+        """The distance in units of centimeters, read together with the range
+        status in a single block transfer, after which the interrupt is cleared.
+        Replaces reading `distance` and calling `clear_interrupt` once
+        `data_ready` is true. Returns None if the range is not valid."""
+        dist = self.read_range_and_status_mm()
+        if dist is None:
+            return None
         return dist / 10
 
+    def read_range_and_status_mm(self):
+        """The distance in units of millimeters, as an integer, read the same
+        way as `read_range_and_status`. Returns None if the range is not valid."""
+        result = self._result_buf
+        self._read_register_into(_VL53L1X_RESULT__RANGE_STATUS, result)
+        self.clear_interrupt()
+        if result[0] != 0x09:
+            return None
+        return struct.unpack_from(
+            ">H",
+            result,
+            _VL53L1X_RESULT__FINAL_CROSSTALK_CORRECTED_RANGE_MM_SD0
+            - _VL53L1X_RESULT__RANGE_STATUS,
+        )[0]
+
     def start_ranging(self):
         """Starts ranging operation."""
-        self._write_register(_SYSTEM__MODE_START, b"\x40")
+        self._write_cmd(_START_RANGING_CMD)
 
     def stop_ranging(self):
         """Stops ranging operation."""
-        self._write_register(_SYSTEM__MODE_START, b"\x00")
+        self._write_cmd(_STOP_RANGING_CMD)
 
     def clear_interrupt(self):
         """Clears new data interrupt."""
-        self._write_register(_SYSTEM__INTERRUPT_CLEAR, b"\x01")
+        self._write_cmd(_CLEAR_INTERRUPT_CMD)
+
+    @property
+    def interrupt_polarity(self):
+        """GPIO1 level that signals new data: 1 for active high, 0 for active low."""
+        return self._int_pol_cache
 
     @property
     def data_ready(self):
         """Returns true if new data is ready, otherwise false."""
         if (
             self._read_register(_GPIO__TIO_HV_STATUS)[0] & 0x01
-            == self._interrupt_polarity
+            == self._int_pol_cache
         ):
             return True
         return False
@@ -246,21 +339,46 @@ class VL53L1X:
     @timing_budget.setter
     def timing_budget(self, val):
         reg_vals = None
-        mode = self.distance_mode
+        mode = self._distance_mode_cache
         if mode == 1:
             reg_vals = TB_SHORT_DIST
         if mode == 2:
             reg_vals = TB_LONG_DIST
         if reg_vals is None:
             raise RuntimeError("Unknown distance mode.")
-        if val not in reg_vals:
+        idx = _BUDGET_IDX.get(val)
+        if idx is None or reg_vals[idx] is None:
             raise ValueError("Invalid timing budget.")
-        self._write_register(_RANGE_CONFIG__TIMEOUT_MACROP_A_HI, reg_vals[val][0])
-        self._write_register(_RANGE_CONFIG__TIMEOUT_MACROP_B_HI, reg_vals[val][1])
+        self._write_register(_RANGE_CONFIG__TIMEOUT_MACROP_A_HI, reg_vals[idx])
         self._timing_budget = val
 
     @property
-    def _interrupt_polarity(self):
+    def inter_measurement(self):
+        """Time between the starts of consecutive measurements in milliseconds
+        while ranging continuously. Must be at least the timing budget; a few
+        ms more gives a steady measurement cadence."""
+        clock_pll = self._osc_clock_pll
+        if clock_pll == 0:
+            return 0
+        period = struct.unpack(
+            ">I", self._read_register(_SYSTEM__INTERMEASUREMENT_PERIOD, 4)
+        )[0]
+        return int(period / (clock_pll * 1.065))
+
+    @inter_measurement.setter
+    def inter_measurement(self, val):
+        if val < self._timing_budget:
+            raise ValueError("Inter-measurement period must be >= timing budget.")
+        period = int(self._osc_clock_pll * val * 1.075)
+        self._write_register(_SYSTEM__INTERMEASUREMENT_PERIOD, struct.pack(">I", period))
+
+    @property
+    def _osc_clock_pll(self):
+        osc = self._read_register(_VL53L1X_RESULT__OSC_CALIBRATE_VAL, 2)
+        return struct.unpack(">H", osc)[0] & 0x3FF
+
+    @property
+    def _read_interrupt_polarity(self):
         int_pol = self._read_register(_GPIO_HV_MUX__CTRL)[0] & 0x10
         int_pol = (int_pol >> 4) & 0x01
         return 0 if int_pol else 1
@@ -268,6 +386,10 @@ class VL53L1X:
     @property
     def distance_mode(self):
         """The distance mode. 1=short (up to 136cm) , 2=long (up to 360cm)."""
+        return self._distance_mode_cache
+
+    @property
+    def _read_distance_mode(self):
         mode = self._read_register(_PHASECAL_CONFIG__TIMEOUT_MACROP)[0]
         if mode == 0x14:
             return 1  # short distance
@@ -277,33 +399,27 @@ class VL53L1X:
 
     @distance_mode.setter
     def distance_mode(self, mode):
-        if mode == 1:
-            # short distance
-            self._write_register(_PHASECAL_CONFIG__TIMEOUT_MACROP, b"\x14")
-            self._write_register(_RANGE_CONFIG__VCSEL_PERIOD_A, b"\x07")
-            self._write_register(_RANGE_CONFIG__VCSEL_PERIOD_B, b"\x05")
-            self._write_register(_RANGE_CONFIG__VALID_PHASE_HIGH, b"\x38")
-            self._write_register(_SD_CONFIG__WOI_SD0, b"\x07\x05")
-            self._write_register(_SD_CONFIG__INITIAL_PHASE_SD0, b"\x06\x06")
-        elif mode == 2:
-            # long distance
-            self._write_register(_PHASECAL_CONFIG__TIMEOUT_MACROP, b"\x0A")
-            self._write_register(_RANGE_CONFIG__VCSEL_PERIOD_A, b"\x0F")
-            self._write_register(_RANGE_CONFIG__VCSEL_PERIOD_B, b"\x0D")
-            self._write_register(_RANGE_CONFIG__VALID_PHASE_HIGH, b"\xB8")
-            self._write_register(_SD_CONFIG__WOI_SD0, b"\x0F\x0D")
-            self._write_register(_SD_CONFIG__INITIAL_PHASE_SD0, b"\x0E\x0E")
-        else:
+        if mode == self._distance_mode_cache:
+            return
+        timing_cmds = _MODE_TIMING_CMDS.get(mode)
+        if timing_cmds is None:
             raise ValueError("Unsupported mode.")
-        self.timing_budget = self._timing_budget
+        idx = _BUDGET_IDX.get(self._timing_budget)
+        if idx is None or timing_cmds[idx] is None:
+            raise ValueError("Invalid timing budget.")
+        phasecal_cmd, sd_config_cmd = _DIST_MODE_CMDS[mode]
+        self._write_cmd(phasecal_cmd)
+        self._write_cmd(timing_cmds[idx])
+        self._write_cmd(sd_config_cmd)
+        self._distance_mode_cache = mode
 
     @property
     def roi_xy(self):
         """Returns the x and y coordinates of the sensor's region of interest"""
-        temp = self._read_register(_ROI_CONFIG__USER_ROI_REQUESTED_GLOBAL_XY_SIZE)
+        xy_size = self._read_register(_ROI_CONFIG__USER_ROI_REQUESTED_GLOBAL_XY_SIZE)[0]
 
-        x = (int.from_bytes(temp, 'big') & 0x0F) + 1
-        y = ((int.from_bytes(temp, 'big') & 0xF0) >> 4) + 1
+        x = (xy_size & 0x0F) + 1
+        y = ((xy_size & 0xF0) >> 4) + 1
 
         return x, y
 
@@ -336,19 +452,35 @@ class VL53L1X:
     def roi_center(self, center):
         self._write_register(_ROI_CONFIG__USER_ROI_CENTRE_SPAD, center.to_bytes(1, 'big'))
 
-    def _write_register(self, address, data, length=None):
-        if length is None:
-            length = len(data)
+    def _write_cmd(self, cmd):
+        """Writes a complete register address + data payload."""
+        with self.i2c_device as i2c:
+            i2c.write(cmd)
+
+    def _write_register(self, address, data):
+        length = len(data)
+        buf = self._write_buf
+        if length + 2 > len(buf):
+            # Only the one-off init sequence is longer than the shared buffer
+            buf = bytearray(length + 2)
+        buf[0] = address >> 8
+        buf[1] = address & 0xFF
+        # The slice is exactly len(data) long, so the shared buffer never changes size
+        buf[2 : 2 + length] = data
         with self.i2c_device as i2c:
-            i2c.write(struct.pack(">H", address) + data[:length])
+            i2c.write(buf, end=2 + length)
 
     def _read_register(self, address, length=1):
         data = bytearray(length)
-        with self.i2c_device as i2c:
-            i2c.write(struct.pack(">H", address))
-            i2c.readinto(data)
+        self._read_register_into(address, data)
         return data
 
+    def _read_register_into(self, address, buf):
+        self._addr_buf[0] = address >> 8
+        self._addr_buf[1] = address & 0xFF
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(self._addr_buf, buf)
+
     def set_address(self, new_address):
         """
         Set a new I2C address to the instantaited object. This is only called when using
@@ -1,14 +1,14 @@
+import gc
 import time
 import board
 import busio
 import sys
 import os
 import storage
+import supervisor
 import keypad
 import adafruit_vl53l1x
 import adafruit_bh1750
-import digitalio
-import neopixel
 
 # Import the custom display library
 from parking_guide_display import ParkingGuideDisplay
@@ -54,13 +54,34 @@ class Settings:
             return None
 
 class Sensors:
-    def __init__(self, i2c_bus, button_pin):
+    def __init__(self, i2c_bus, button_pin, tof_int_pin=None):
         # --- ToF Distance Sensor ---
         self.tof_sensor = adafruit_vl53l1x.VL53L1X(i2c_bus)
         self.tof_sensor.distance_mode = 2
-        self.tof_sensor.timing_budget = 100
+        self.tof_budget_ms = 100
+        self.tof_sensor.timing_budget = self.tof_budget_ms
+        # Start a measurement every budget + 5 ms, so the sensor has a fixed
+        # cadence; callers should poll at this period to find a new sample each time
+        self.tof_sensor.inter_measurement = self.tof_budget_ms + 5
+        self.tof_period_s = (self.tof_budget_ms + 5) / 1000
+        self._tof_budget_s = self.tof_budget_ms / 1000
         self.tof_current_mode = 2  # 1 for Short, 2 for Long
-        self.tof_switch_threshold_cm = 90.0
+        self.tof_ranging = False
+        # Dead band around the 90 cm switch point so jitter near it can't flip
+        # the mode (a multi-register reconfiguration) on every sample
+        self.tof_short_below_mm = 850
+        self.tof_long_above_mm = 950
+        # True when the last get_distance() call consumed a new measurement
+        self.tof_sample_fresh = False
+        self._last_tof_read_time = 0.0
+        # Optional VL53L1X GPIO1 (data ready). The driver's init sequence makes it active
+        # high: it rises when a sample is ready and falls again on clear_interrupt().
+        # keypad queues the ready edges in C, so a sample is noticed without an I2C status read.
+        self._tof_int_keys = None
+        if tof_int_pin is not None:
+            self._tof_int_keys = keypad.Keys(
+                (tof_int_pin,), value_when_pressed=bool(self.tof_sensor.interrupt_polarity), pull=True)
+            self._tof_int_event = keypad.Event()
 
         # --- Light Sensor ---
         self.light_sensor = None
@@ -74,28 +95,77 @@ class Sensors:
         self.button = keypad.Keys((button_pin,), value_when_pressed=False, pull=True)
 
     def start_ranging(self):
+        # States call this every tick, so only touch the sensor when it's stopped
+        if self.tof_ranging:
+            return
         self.tof_sensor.start_ranging()
+        # Drop any sample left over from the last run so the next read is a new one
+        self.tof_sensor.clear_interrupt()
+        if self._tof_int_keys is not None:
+            self._tof_int_keys.events.clear()
+        self.tof_ranging = True
 
     def stop_ranging(self):
+        if not self.tof_ranging:
+            return
         self.tof_sensor.stop_ranging()
-
-    def get_distance(self):
-        if self.tof_sensor.data_ready:
-            distance = self.tof_sensor.distance
-            self.tof_sensor.clear_interrupt()
-            if distance is not None:
-                if distance < self.tof_switch_threshold_cm and self.tof_current_mode == 2:
-                    self.tof_sensor.distance_mode = 1
-                    self.tof_current_mode = 1
-                elif distance >= self.tof_switch_threshold_cm and self.tof_current_mode == 1:
-                    self.tof_sensor.distance_mode = 2
-                    self.tof_current_mode = 2
-                return distance
-            if distance is None:
-                self.tof_sensor.distance_mode = 2
-                self.tof_current_mode = 2
+        self.tof_ranging = False
+
+    def measure_once(self, timeout_s=0.5):
+        """Ranges just until the first new sample arrives and returns it in cm, or None on timeout."""
+        self.start_ranging()
+        deadline = time.monotonic() + timeout_s
+        distance = None
+        while time.monotonic() < deadline:
+            distance = self.get_distance()
+            if self.tof_sample_fresh:
+                break
+            time.sleep(0.005)
+        self.stop_ranging()
+        return distance
+
+    def get_distance(self, now=None):
+        self.tof_sample_fresh = False
+        # A new measurement can't be ready before one timing budget has passed,
+        # so don't spend an I2C transaction asking. The main loop passes its own
+        # tick time so the check lines up with its pacing.
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_tof_read_time < self._tof_budget_s:
+            return None
+        if self._tof_data_ready():
+            self.tof_sample_fresh = True
+            self._last_tof_read_time = now
+            # Mode switching works on the sensor's integer millimeters; only the
+            # value handed back to the app is converted to centimeters
+            distance_mm = self.tof_sensor.read_range_and_status_mm()
+            if distance_mm is not None:
+                if self.tof_current_mode == 2:
+                    if distance_mm < self.tof_short_below_mm:
+                        self._set_tof_mode(1)
+                elif distance_mm > self.tof_long_above_mm:
+                    self._set_tof_mode(2)
+                return distance_mm / 10
+            # No valid range: fall back to long mode, which covers the whole bar
+            self._set_tof_mode(2)
         return None
 
+    def _set_tof_mode(self, mode):
+        if mode == self.tof_current_mode:
+            return
+        self.tof_sensor.distance_mode = mode
+        self.tof_current_mode = mode
+
+    def _tof_data_ready(self):
+        if self._tof_int_keys is None:
+            return self.tof_sensor.data_ready
+        # Drain the queue; any ready edge since the last read means a new sample
+        ready = False
+        while self._tof_int_keys.events.get_into(self._tof_int_event):
+            if self._tof_int_event.pressed:
+                ready = True
+        return ready
+
     def get_light_level(self):
         if self.light_sensor:
             try:
@@ -138,6 +208,14 @@ app_configs = {
     "CALIBRATION_SAMPLES": 5,
     "CALIBRATION_COUNTDOWN_S": 5,
     "CONSOLE_LOG_INTERVAL_S": 5,
+    "SCORE_DISPLAY_DURATION_S": 5,
+    # Hardware Configs
+    # The HT16K33 is only rated for 400 kHz; faster clocks need short wiring and
+    # strong (2.2k or lower) pull-ups, so raise this only after testing the display
+    "MATRIX_I2C_FREQUENCY_HZ": 400000,
+    # Board pin wired to the VL53L1X GPIO1 data-ready line, e.g. board.GP14. Left as None,
+    # the sensor is polled over I2C for new samples, which needs no extra wiring.
+    "TOF_INT_PIN": None,
 }
 
 # =================================================================
@@ -148,9 +226,10 @@ def main():
 
     # --- Initialize Hardware ---
     try:
-        i2c_sensor_bus = busio.I2C(board.GP11, board.GP10)
-        i2c_matrix_bus = busio.I2C(board.GP21, board.GP20)
-        sensor_manager = Sensors(i2c_sensor_bus, button_pin=board.GP15)
+        # The VL53L1X/BH1750 and the HT16K33 matrices all handle 400 kHz fast mode
+        i2c_sensor_bus = busio.I2C(board.GP11, board.GP10, frequency=400000)
+        i2c_matrix_bus = busio.I2C(board.GP21, board.GP20, frequency=app_configs["MATRIX_I2C_FREQUENCY_HZ"])
+        sensor_manager = Sensors(i2c_sensor_bus, button_pin=board.GP15, tof_int_pin=app_configs["TOF_INT_PIN"])
         settings_manager = Settings()
         guide_display = ParkingGuideDisplay(
             matrix_i2c_bus=i2c_matrix_bus,
@@ -168,28 +247,52 @@ def main():
     if target_distance is None:
         state = "AWAITING_CALIBRATION"
     else:
-        state = "MONITORING_LIGHT"
-        guide_display.set_neopixels("green")
-        time.sleep(1)
-        guide_display.set_neopixels("off")
+        state = "CONFIRMING"
 
     # --- State Machine Variables ---
-    last_light_check_time = time.monotonic()
-    last_lux_reading = sensor_manager.get_light_level() or 0
-    state_enter_time = time.monotonic()
-    stable_since_time = time.monotonic()
-    last_log_time = time.monotonic()
+    last_lux_reading = 0
+    start_time = time.monotonic()
+    last_light_check_time = start_time
+    state_enter_time = start_time
+    stable_since_time = start_time
+    last_log_time = start_time
     previous_state = ""
+    entered_from = "" # State the machine was in before the current one
+    confirm_deadline = start_time
     last_known_distance = 0
+    blink_on = False
+    next_blink_time = start_time
+    countdown_digit = None
+    calibration_readings = []
+
+    # --- Loop Constants ---
+    # The configs don't change at runtime, so resolve them once instead of every tick
+    tolerance_cm = (display_configs["CONFIG_PHASE2_STATIC_MARKER_OFFSET_PCT"] / 100.0) * display_configs["UPPER_RANGE_CM"]
+    log_interval_s = app_configs["CONSOLE_LOG_INTERVAL_S"]
+    light_monitor_interval_s = app_configs["LIGHT_MONITOR_INTERVAL_S"]
+    significant_light_change_lux = app_configs["SIGNIFICANT_LIGHT_CHANGE_LUX"]
+    ranging_duration_s = app_configs["ACTIVE_RANGING_DURATION_S"]
+    stable_duration_s = app_configs["STABLE_DISTANCE_DURATION_S"]
+    idle_duration_s = app_configs["IDLE_AFTER_PARKING_DURATION_S"]
+    enable_scoring = app_configs["ENABLE_SCORING"]
+    score_display_s = app_configs["SCORE_DISPLAY_DURATION_S"]
+    calibration_countdown_s = app_configs["CALIBRATION_COUNTDOWN_S"]
+    calibration_samples = app_configs["CALIBRATION_SAMPLES"]
+    # Scores 1-9 split the error between 1 cm and the tolerance into nine equal bands
+    score_step = (tolerance_cm - 1.0) / 9.0
+    score_inv_step = 1.0 / score_step if score_step > 0 else 0.0
+    score_bands = tuple((i, 1 + (i - 1) * score_step, 1 + i * score_step) for i in range(1, 10))
+    # Valid parking window around the target; recomputed whenever the target changes
+    park_lo = park_hi = None
+    if target_distance is not None:
+        park_lo = target_distance - tolerance_cm
+        park_hi = target_distance + tolerance_cm
 
     # --- Calculate and Print Parking Window ---
     def print_parking_window(current_target):
         if current_target is None:
             return
-        upper_range = display_configs["UPPER_RANGE_CM"]
         offset_pct = display_configs["CONFIG_PHASE2_STATIC_MARKER_OFFSET_PCT"]
-        tolerance_cm = (offset_pct / 100.0) * upper_range
-        
         lower_bound = current_target - tolerance_cm
         upper_bound = current_target + tolerance_cm
         
@@ -201,149 +304,105 @@ def main():
         # Print scoring breakdown
         print("Scoring (0 is perfect):")
         print(f"  Score 0: {current_target - 1:.1f} cm to {current_target + 1:.1f} cm")
-        for i in range(1, 10):
-            step = (tolerance_cm - 1) / 9
-            min_err = 1 + (i - 1) * step
-            max_err = 1 + i * step
+        for i, min_err, max_err in score_bands:
             print(f"  Score {i}: {min_err:.1f} to {max_err:.1f} cm away from target")
         print("-" * 40)
 
     print_parking_window(target_distance)
     print(f"\n--- System Ready. Initial state: {state} ---")
+    # Start the loop on a compacted heap, with the init-time garbage gone
+    gc.collect()
 
     # --- Main Loop (State Machine) ---
+    # Ticks are scheduled one ToF measurement period apart from a fixed start, so
+    # the cadence doesn't drift with however long each tick's work takes and each
+    # ranging tick lands just after a new sample
+    tick_period = sensor_manager.tof_period_s
+    # Bind the per-tick calls once; get_into() fills one reused Event instead of
+    # allocating a new one every tick
+    button_events = sensor_manager.button.events
+    button_event = keypad.Event()
+    get_distance = sensor_manager.get_distance
+    display_update = guide_display.update
+    next_tick = time.monotonic()
     try:
         while True:
             now = time.monotonic()
             
-            if state != previous_state:
+            state_entered = state != previous_state
+            if state_entered:
                 print(f"\n--- State Change: {previous_state} -> {state} ---")
+                # Collect between states rather than mid-render
+                gc.collect()
+                entered_from = previous_state
                 previous_state = state
                 state_enter_time = now
                 last_log_time = now # Reset log timer on state change
 
-            event = sensor_manager.button.events.get()
-            if event and event.pressed:
+            if button_events.get_into(button_event) and button_event.pressed:
                 if state != "CALIBRATING":
                     print("Button override! Starting calibration...")
                     state = "CALIBRATING"
                     sensor_manager.stop_ranging()
                     continue
 
-            if state == "AWAITING_CALIBRATION":
-                if (now // 1) % 2 == 0:
-                    guide_display.set_neopixels("yellow")
-                else:
-                    guide_display.set_neopixels("off")
-                if now - last_log_time > app_configs["CONSOLE_LOG_INTERVAL_S"]:
-                    print("Awaiting calibration... Press button to begin.")
-                    last_log_time = now
+            # States are tested in rough order of how many ticks they run for, so the
+            # long-running ranging and monitoring states hit their branch first
+            if state == "ACTIVE_RANGING":
+                sensor_manager.start_ranging()
+                current_distance = get_distance(next_tick)
+                if current_distance is not None:
+                    last_known_distance = current_distance
+                # Only redraw when the sensor produced a new sample
+                if sensor_manager.tof_sample_fresh:
+                    display_update(current_distance, target_distance)
                 
-            elif state == "CALIBRATING":
-                guide_display.set_neopixels("red")
-                for i in range(app_configs["CALIBRATION_COUNTDOWN_S"], 0, -1):
-                    guide_display.show_countdown(i)
-                    time.sleep(1)
-                guide_display.clear()
+                # Skip formatting the status line when nobody is on the serial console
+                if now - last_log_time > log_interval_s and supervisor.runtime.serial_connected:
+                    print(f"Ranging... Dist: {last_known_distance:.1f} cm. Timeout in {ranging_duration_s - (now - state_enter_time):.0f}s")
+                    last_log_time = now
 
-                print("Taking distance samples...")
-                sensor_manager.start_ranging()
-                time.sleep(0.5)
-                readings = []
-                while len(readings) < app_configs["CALIBRATION_SAMPLES"]:
-                    dist = sensor_manager.get_distance()
-                    if dist is not None:
-                        readings.append(dist)
-                        print(f"  Sample {len(readings)}: {dist:.1f} cm")
-                        time.sleep(0.2)
-                sensor_manager.stop_ranging()
+                if now - state_enter_time > ranging_duration_s:
+                    state = "IDLE_COOLDOWN"
                 
-                if readings:
-                    avg_dist = sum(readings) / len(readings)
-                    target_distance = settings_manager.save_parked_distance(avg_dist)
-                    if target_distance is not None:
-                        print_parking_window(target_distance)
-                        guide_display.set_neopixels("green")
-                        time.sleep(2)
-                        state = "MONITORING_LIGHT"
-                        last_lux_reading = sensor_manager.get_light_level() or 0
-                    else:
-                        state = "AWAITING_CALIBRATION"
+                if current_distance is not None and park_lo <= current_distance <= park_hi:
+                    if now - stable_since_time > stable_duration_s:
+                        state = "SHOWING_SCORE"
                 else:
-                    state = "AWAITING_CALIBRATION"
+                    stable_since_time = now
 
             elif state == "MONITORING_LIGHT":
-                guide_display.clear()
-                if now - last_light_check_time > app_configs["LIGHT_MONITOR_INTERVAL_S"]:
+                # The display stays blank while monitoring, so only clear it on entry.
+                # Entry is also the one place the light baseline is taken; the first
+                # comparison then waits a full monitor interval.
+                if state_entered:
+                    guide_display.clear()
+                    last_lux_reading = sensor_manager.get_light_level() or 0
+                    last_light_check_time = now
+                if now - last_light_check_time > light_monitor_interval_s:
                     current_lux = sensor_manager.get_light_level()
                     last_light_check_time = now
                     if current_lux is not None:
                         light_change = abs(current_lux - last_lux_reading)
                         print(f"Light check: Current={current_lux:.1f} lux, Last={last_lux_reading:.1f} lux, Change={light_change:.1f} lux")
-                        if light_change > app_configs["SIGNIFICANT_LIGHT_CHANGE_LUX"]:
+                        if light_change > significant_light_change_lux:
                             print(">>> Significant light change detected! Checking distance...")
-                            sensor_manager.start_ranging()
-                            time.sleep(0.5)
-                            dist = sensor_manager.get_distance()
-                            sensor_manager.stop_ranging()
+                            dist = sensor_manager.measure_once()
                             
                             last_lux_reading = current_lux
                             
-                            tolerance_cm = (display_configs["CONFIG_PHASE2_STATIC_MARKER_OFFSET_PCT"] / 100.0) * display_configs["UPPER_RANGE_CM"]
-                            if dist is None or abs(dist - target_distance) > tolerance_cm:
+                            if dist is None or not park_lo <= dist <= park_hi:
                                 state = "ACTIVE_RANGING"
                             else:
                                 state = "IDLE_COOLDOWN"
-                    
-
-            elif state == "ACTIVE_RANGING":
-                sensor_manager.start_ranging()
-                current_distance = sensor_manager.get_distance()
-                print(current_distance, sensor_manager.tof_current_mode)#DEBUG HERE
-                if current_distance is not None:
-                    last_known_distance = current_distance
-                guide_display.update(current_distance, target_distance)
-                
-                if now - last_log_time > app_configs["CONSOLE_LOG_INTERVAL_S"]:
-                    print(f"Ranging... Dist: {last_known_distance:.1f} cm. Timeout in {app_configs['ACTIVE_RANGING_DURATION_S'] - (now - state_enter_time):.0f}s")
-                    last_log_time = now
-
-                if now - state_enter_time > app_configs["ACTIVE_RANGING_DURATION_S"]:
-                    state = "IDLE_COOLDOWN"
-                
-                tolerance_cm = (display_configs["CONFIG_PHASE2_STATIC_MARKER_OFFSET_PCT"] / 100.0) * display_configs["UPPER_RANGE_CM"]
-                if current_distance is not None and abs(current_distance - target_distance) <= tolerance_cm:
-                    if now - stable_since_time > app_configs["STABLE_DISTANCE_DURATION_S"]:
-                        state = "SHOWING_SCORE"
-                else:
-                    stable_since_time = now
-
-            elif state == "SHOWING_SCORE":
-                sensor_manager.stop_ranging()
-                if app_configs["ENABLE_SCORING"]:
-                    tolerance_cm = (display_configs["CONFIG_PHASE2_STATIC_MARKER_OFFSET_PCT"] / 100.0) * display_configs["UPPER_RANGE_CM"]
-                    error = abs(last_known_distance - target_distance)
-                    
-                    score = 9
-                    if error <= 1.0:
-                        score = 0
-                    else:
-                        step = (tolerance_cm - 1.0) / 9.0
-                        if step > 0:
-                            score = int((error - 1.0) / step) + 1
-                            score = min(9, max(1, score))
-                            
-                    print(f"Final distance: {last_known_distance:.1f} cm, Error: {error:.1f} cm, Score: {score}")
-                    guide_display.show_score(score)
-                    time.sleep(5)
-                state = "IDLE_COOLDOWN"
 
             elif state == "IDLE_COOLDOWN":
                 sensor_manager.stop_ranging()
-                guide_display.set_neopixels("off") # Turn off neopixels during cooldown count
+                if state_entered:
+                    guide_display.set_neopixels("off") # Turn off neopixels during cooldown count
 
-                if now - last_log_time > app_configs["CONSOLE_LOG_INTERVAL_S"]:
-                    total_cooldown = app_configs["IDLE_AFTER_PARKING_DURATION_S"]
+                if now - last_log_time > log_interval_s:
+                    total_cooldown = idle_duration_s
                     elapsed_time = now - state_enter_time
                     remaining_time = total_cooldown - elapsed_time
                     
@@ -359,12 +418,98 @@ def main():
                     print(f"In cooldown... Resuming monitoring in {remaining_time:.0f}s")
                     last_log_time = now
                 
-                if now - state_enter_time > app_configs["IDLE_AFTER_PARKING_DURATION_S"]:
+                if now - state_enter_time > idle_duration_s:
                     guide_display.clear() # Clear the final digit before switching state
                     state = "MONITORING_LIGHT"
-                    last_lux_reading = sensor_manager.get_light_level() or 0
 
-            time.sleep(sensor_manager.tof_sensor.timing_budget/1000)
+            elif state == "AWAITING_CALIBRATION":
+                # The strips latch their color, so they only need a write on each blink edge
+                if state_entered:
+                    blink_on = True
+                    next_blink_time = now + 1.0
+                    guide_display.set_neopixels("yellow")
+                elif now >= next_blink_time:
+                    blink_on = not blink_on
+                    next_blink_time += 1.0
+                    guide_display.set_neopixels("yellow" if blink_on else "off")
+                if now - last_log_time > log_interval_s and supervisor.runtime.serial_connected:
+                    print("Awaiting calibration... Press button to begin.")
+                    last_log_time = now
+
+            elif state == "CALIBRATING":
+                # Count down on the loop tick, redrawing only when the digit changes
+                if state_entered:
+                    guide_display.set_neopixels("red")
+                    countdown_digit = None
+                remaining = calibration_countdown_s - int(now - state_enter_time)
+                if remaining <= 0:
+                    guide_display.clear()
+                    print("Taking distance samples...")
+                    state = "CALIBRATION_SAMPLING"
+                elif remaining != countdown_digit:
+                    countdown_digit = remaining
+                    guide_display.show_countdown(remaining)
+
+            elif state == "CALIBRATION_SAMPLING":
+                # Collect one reading per new sensor sample until there are enough
+                if state_entered:
+                    sensor_manager.start_ranging()
+                    calibration_readings = []
+                dist = get_distance(next_tick)
+                if dist is not None:
+                    calibration_readings.append(dist)
+                    print(f"  Sample {len(calibration_readings)}: {dist:.1f} cm")
+                if len(calibration_readings) >= calibration_samples:
+                    sensor_manager.stop_ranging()
+                    state = "AWAITING_CALIBRATION"
+                    if calibration_readings:
+                        avg_dist = sum(calibration_readings) / len(calibration_readings)
+                        target_distance = settings_manager.save_parked_distance(avg_dist)
+                        if target_distance is not None:
+                            park_lo = target_distance - tolerance_cm
+                            park_hi = target_distance + tolerance_cm
+                            print_parking_window(target_distance)
+                            state = "CONFIRMING"
+
+            elif state == "CONFIRMING":
+                # Green flash for a loaded target (1 s) or a new calibration (2 s); the
+                # button stays live meanwhile
+                if state_entered:
+                    guide_display.set_neopixels("green")
+                    confirm_deadline = now + (2 if entered_from == "CALIBRATION_SAMPLING" else 1)
+                elif now > confirm_deadline:
+                    state = "MONITORING_LIGHT"
+
+            elif state == "SHOWING_SCORE":
+                # Score once on entry, then leave it up while the loop keeps
+                # polling the button, instead of sleeping through it
+                if not enable_scoring:
+                    state = "IDLE_COOLDOWN"
+                elif state_entered:
+                    sensor_manager.stop_ranging()
+                    error = abs(last_known_distance - target_distance)
+                    
+                    score = 9
+                    if error <= 1.0:
+                        score = 0
+                    elif score_inv_step > 0:
+                        score = int((error - 1.0) * score_inv_step) + 1
+                        score = min(9, max(1, score))
+                            
+                    print(f"Final distance: {last_known_distance:.1f} cm, Error: {error:.1f} cm, Score: {score}")
+                    guide_display.show_score(score)
+                elif now - state_enter_time > score_display_s:
+                    state = "IDLE_COOLDOWN"
+
+            # The sensor keeps measuring while this tick renders, so only sleep
+            # until the next scheduled tick. After falling behind (a blocking
+            # state), restart the schedule instead of bursting to catch up.
+            next_tick += tick_period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
 
     except KeyboardInterrupt:
         print("\nCtrl+C detected.")
@@ -48,9 +48,7 @@ class Sensors:
         
     def get_distance(self):
         if self.sensor.data_ready:
-            distance = self.sensor.distance
-            self.sensor.clear_interrupt()
-            return distance
+            return self.sensor.read_range_and_status()
         
     def get_light_reading(self):
         light_reading = self.light_sensor.value
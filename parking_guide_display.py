@@ -1,8 +1,14 @@
 import time
-import sys
+from micropython import const
 from adafruit_ht16k33.matrix import Matrix8x8x2
 import neopixel
 import digitalio
+from neopixel_write import neopixel_write
+
+# Per-column static marker overlay values: a Matrix8x8x2.LED_* code, optionally flagged
+# to only apply to an unlit column, or no marker at all
+_NO_MARKER = const(0xFF)
+_MARKER_IF_UNLIT = const(0x80)
 
 class ParkingGuideDisplay:
     """
@@ -21,37 +27,104 @@ class ParkingGuideDisplay:
         """
         self.config = configs
         self.matrices = []
+        self._matrix_addresses = []
+        self._i2c_bus = None
         self.pixels1 = None
         self.pixels2 = None
+        self._neopixel_rgb = None # RGB currently shown on both strips, None if unknown
+        self._neopixel_order = 'GRB'
+        self._neopixel_num_leds = 0
+        # Wire-order bytes for a whole strip of one color, keyed by RGB tuple; both strips share them
+        self._neopixel_payloads = {}
         self.oe_enable = None
         self.total_display_columns = 0
+        # Per-column Matrix8x8x2.LED_* codes for the frame being rendered
+        self._column_colors = bytearray(0)
+        # Last frame written to the matrices; only trusted while _matrices_dirty is False
+        self._flushed_colors = bytearray(0)
+        self._matrices_dirty = True
+        # True while every matrix is known to be showing nothing, so clear() can skip the bus
+        self._matrices_blank = False
+        # Copy of each matrix framebuffer as last sent over I2C
+        self._sent_buffers = []
+        # Holds the changed span of a framebuffer, behind its RAM start address, for partial sends
+        self._flush_scratch = bytearray(0)
+        # (framebuffer, green byte index) for each display column, fixed once the matrices are found
+        self._column_targets = ()
+        # Pixel bytes of the first matrix showing a digit, keyed by (digit, LED_* code)
+        self._digit_frames = {}
+        # Everything that only depends on the target and the column count:
+        # the target as a bar percentage, phase 1 / phase 2 pattern details and the two phase thresholds
+        self._pattern_cache_valid = False
+        self._pattern_target_cm = None
+        self._pattern_target_pct = 50.0
+        self._pattern_cols = 0
+        self._pattern_cache = [None, None]
+        self._zoom_threshold_pct = 0.0
+        self._p1_color_thresh_pct = 0.0
+        # Inputs of the last update(); only trusted while _last_update_valid is True, which
+        # anything else drawing on the matrices or strips resets
+        self._last_distance_cm = None
+        self._last_target_cm = None
+        self._last_update_valid = False
 
         # Unpack error codes for internal use
         self.TOF_READING_ERROR = self.config.get('TOF_READING_ERROR', -1.0)
 
+        # Unpack the settings read on every frame
+        self._upper_range_cm = self.config.get('UPPER_RANGE_CM', 190.0)
+        self._cols_per_unit = self.config.get('MATRIX_COLUMNS_PER_UNIT', 8)
+        self._show_precise_indicator = self.config['PHASE2_SHOW_PRECISE_INDICATOR']
+        self._slider_start_color = self.config['CONFIG_SLIDER_START_COLOR']
+        self._slider_end_color = self.config['CONFIG_SLIDER_END_COLOR_PHASE1']
+        self._after_1st_static_color = self.config['CONFIG_SLIDER_COLOR_AFTER_1ST_STATIC_ZOOMED']
+
         # Color maps
         self._MATRIX_COLOR_MAP = {
             "off": Matrix8x8x2.LED_OFF, "red": Matrix8x8x2.LED_RED,
             "green": Matrix8x8x2.LED_GREEN, "yellow": Matrix8x8x2.LED_YELLOW
         }
+        # Green plane and red plane byte for a fully lit column, indexed by the
+        # Matrix8x8x2.LED_* code (off, red, green, yellow). The HT16K33 stores each
+        # column as one green and one red byte.
+        self._GREEN_BITS = b'\x00\x00\xff\xff'
+        self._RED_BITS = b'\x00\xff\x00\xff'
         self._NEOPIXEL_COLOR_MAP = {
             "off": (0, 0, 0), "red": (255, 0, 0), "green": (0, 255, 0),
             "yellow": (255, 45, 0), "blue": (0, 0, 255)
         }
+        # Configured matrix colors as Matrix8x8x2.LED_* codes, resolved once so the
+        # renderer doesn't map color names every frame
+        self._off_code = self._MATRIX_COLOR_MAP["off"]
+        self._left_code = self._resolve_matrix_color('CONFIG_LEFT_STATIC_COLOR')
+        self._center_code = self._resolve_matrix_color('CONFIG_CENTER_STATIC_COLOR')
+        self._right_code = self._resolve_matrix_color('CONFIG_RIGHT_STATIC_COLOR')
+        self._slider_start_code = self._resolve_matrix_color('CONFIG_SLIDER_START_COLOR')
+        self._slider_end_code = self._resolve_matrix_color('CONFIG_SLIDER_END_COLOR_PHASE1')
+        self._indicator_code = self._resolve_matrix_color('CONFIG_PRECISE_INDICATOR_COLOR')
         
         # The standard 5x7 font that we confirmed works correctly.
         self._FONT = {
-            '0': (" 111 ", "1   1", "1   1", "1   1", " 111 "),
-            '1': ("  1  ", " 11  ", "  1  ", "  1  ", " 111 "),
-            '2': (" 111 ", "1   1", "   1 ", "  1  ", "11111"),
-            '3': ("1111 ", "    1", " 111 ", "    1", "1111 "),
-            '4': ("1  1 ", "1  1 ", "11111", "   1 ", "   1 "),
-            '5': ("11111", "1    ", "1111 ", "    1", " 111 "),
-            '6': (" 111 ", "1    ", "1111 ", "1   1", " 111 "),
-            '7': ("11111", "   1 ", "  1  ", " 1   ", " 1   "),
-            '8': (" 111 ", "1   1", " 111 ", "1   1", " 111 "),
-            '9': (" 111 ", "1   1", " 1111", "    1", " 111 "),
+            '0': (0b01110, 0b10001, 0b10001, 0b10001, 0b01110),
+            '1': (0b00100, 0b01100, 0b00100, 0b00100, 0b01110),
+            '2': (0b01110, 0b10001, 0b00010, 0b00100, 0b11111),
+            '3': (0b11110, 0b00001, 0b01110, 0b00001, 0b11110),
+            '4': (0b10010, 0b10010, 0b11111, 0b00010, 0b00010),
+            '5': (0b11111, 0b10000, 0b11110, 0b00001, 0b01110),
+            '6': (0b01110, 0b10000, 0b11110, 0b10001, 0b01110),
+            '7': (0b11111, 0b00010, 0b00100, 0b01000, 0b01000),
+            '8': (0b01110, 0b10001, 0b01110, 0b10001, 0b01110),
+            '9': (0b01110, 0b10001, 0b01111, 0b00001, 0b01110),
         }
+        # Each digit as (green byte index, row bitmask) pairs for the framebuffer, keyed by
+        # the integer digit. Glyph pixel (x, y) lands on matrix[7 - y, 7 - (x + 1)], the
+        # confirmed working transformation from the test program, so glyph row y is
+        # framebuffer column 7 - y and pixel x (bit 4 - x of the row) moves up to bit 6 - x.
+        self._digit_columns = {}
+        for char, font_char in self._FONT.items():
+            self._digit_columns[int(char)] = tuple(
+                (1 + 2 * (7 - y), row_bits << 2) for y, row_bits in enumerate(font_char)
+            )
 
 
         self._initialize_neopixels(neopixel_pin_1, neopixel_pin_2)
@@ -66,49 +139,61 @@ class ParkingGuideDisplay:
         if current_distance_cm is None:
             current_distance_cm = self.TOF_READING_ERROR
 
+        # The display is a pure function of these two inputs, so a repeat reading
+        # (common once parked) leaves nothing to do
+        if (self._last_update_valid and current_distance_cm == self._last_distance_cm
+                and target_distance_cm == self._last_target_cm):
+            return
+        self._last_distance_cm = current_distance_cm
+        self._last_target_cm = target_distance_cm
+        self._last_update_valid = True
+
         # --- Percentage Calculations ---
-        upper_range = self.config.get('UPPER_RANGE_CM', 190.0)
-        current_progress_percent = self._calculate_current_tof_percentage(current_distance_cm, upper_range)
-        derived_target_pct = self._calculate_derived_target_percentage(target_distance_cm, upper_range)
+        # Inlined rather than a helper call, as this runs on every new reading
+        upper_range = self._upper_range_cm
+        if current_distance_cm < 0 or current_distance_cm > upper_range:
+            current_progress_percent = self.TOF_READING_ERROR
+        elif upper_range == 0:
+            current_progress_percent = 100.0
+        else:
+            current_progress_percent = ((upper_range - current_distance_cm) / upper_range) * 100.0
+            if current_progress_percent > 100.0: current_progress_percent = 100.0
 
         tof_is_error = current_progress_percent <= self.TOF_READING_ERROR
         effective_progress = 0.0 if tof_is_error else current_progress_percent
 
         # --- Determine Display State ---
-        # DYNAMIC THRESHOLD: Calculate the zoom transition point as a percentage
-        # of the way to the target, not as a static percentage of the whole bar.
-        zoom_config_pct = self.config.get('CONFIG_ZOOM_TRANSITION_THRESHOLD_PERCENT', 75.0)
-        dynamic_zoom_threshold = (zoom_config_pct / 100.0) * derived_target_pct
-        is_phase2_active = effective_progress >= dynamic_zoom_threshold
+        # DYNAMIC THRESHOLD: The zoom transition point is a percentage of the way
+        # to the target, not a static percentage of the whole bar.
+        self._refresh_target_cache(target_distance_cm)
+        derived_target_pct = self._pattern_target_pct
+        is_phase2_active = effective_progress >= self._zoom_threshold_pct
 
-        pattern_details = self._get_pattern_display_details(
-            effective_progress, is_phase2_active, derived_target_pct
-        )
+        pattern_details = self._get_cached_pattern_details(is_phase2_active, derived_target_pct)
+
+        # Both outputs show the same progress color, so pick it once per frame
+        progress_color = self._get_current_progress_color(effective_progress, is_phase2_active, self._p1_color_thresh_pct, pattern_details)
 
         # --- Update Hardware ---
-        self._update_neopixel_strips(effective_progress, is_phase2_active, tof_is_error, pattern_details, derived_target_pct)
+        self._update_neopixel_strips(progress_color, tof_is_error)
         if self.total_display_columns > 0:
-            self._render_matrix_display(effective_progress, derived_target_pct, pattern_details)
+            self._render_matrix_display(effective_progress, is_phase2_active, pattern_details, progress_color)
 
     def clear(self):
         """Turns off all LEDs on both matrices and NeoPixel strips."""
-        if self.matrices:
-            for matrix_obj in self.matrices:
-                try:
-                    matrix_obj.fill(self._MATRIX_COLOR_MAP["off"])
-                    matrix_obj.show()
-                except OSError:
-                    pass # Ignore I2C errors on clear
+        self._clear_matrices()
         if self.pixels1 and self.pixels2:
             self._set_neopixel_color("off")
 
     def show_error_state(self):
         """Sets the display to a predefined error state (e.g., blue NeoPixels)."""
-        self.clear()
+        # The strips go straight to blue rather than being sent off first
+        self._clear_matrices()
         self._set_neopixel_color("blue")
 
     def set_neopixels(self, color_name):
         """Directly sets the neopixel color. Publicly accessible."""
+        self._last_update_valid = False
         self._set_neopixel_color(color_name)
 
     def show_countdown(self, number):
@@ -133,32 +218,57 @@ class ParkingGuideDisplay:
         """
         if not self.matrices:
             return
-        
-        for m in self.matrices:
-            m.fill(0)
 
-        matrix = self.matrices[0]
-        char_to_draw = str(number)
-        
-        if char_to_draw in self._FONT:
-            font_char = self._FONT[char_to_draw]
-            color_value = self._MATRIX_COLOR_MAP.get(color_name, self._MATRIX_COLOR_MAP["off"])
-            
-            for y, row_str in enumerate(font_char):
-                for x, pixel in enumerate(row_str):
-                    if pixel == '1':
-                        # This is the confirmed working transformation from the test program.
-                        matrix[7 - y, 7 - (x + 1)] = color_value
-        
-        for m in self.matrices:
-            try:
-                m.show()
-            except OSError:
-                pass
+        self._matrices_dirty = True
+        self._matrices_blank = False
+        self._last_update_valid = False
+        self._blank_framebuffers()
+
+        color_value = self._MATRIX_COLOR_MAP.get(color_name, self._off_code)
+        frame = self._get_digit_frame(number, color_value)
+        if frame is not None:
+            self.matrices[0]._buffer[1:] = frame
+
+        self._flush_matrices(True)
+
+    def _get_digit_frame(self, number, color_value):
+        """
+        Returns the pixel bytes of the first matrix showing a digit, building them on first use.
+        :param number: The integer to display.
+        :param color_value: The Matrix8x8x2.LED_* code to draw the digit in.
+        :return: The bytes following the RAM address byte, or None if there is no glyph for number.
+        """
+        key = (number, color_value)
+        frame = self._digit_frames.get(key)
+        if frame is None:
+            columns = self._digit_columns.get(number)
+            if columns is None:
+                return None
+            green = self._GREEN_BITS[color_value]
+            red = self._RED_BITS[color_value]
+            pixels = bytearray(len(self.matrices[0]._buffer))
+            for green_idx, mask in columns:
+                pixels[green_idx] = mask & green
+                pixels[green_idx + 1] = mask & red
+            frame = bytes(pixels[1:])
+            self._digit_frames[key] = frame
+        return frame
 
 
     # --- Private Initialization Methods ---
 
+    def _resolve_matrix_color(self, config_key):
+        """
+        Looks up a configured matrix color name, warning once about unknown names.
+        :param config_key: The config entry holding the color name.
+        :return: The Matrix8x8x2.LED_* code, LED_OFF if the name is unknown.
+        """
+        color_name = self.config.get(config_key, "off")
+        if color_name not in self._MATRIX_COLOR_MAP:
+            print(f"Warning: Unknown matrix color '{color_name}' for {config_key}, using off.")
+            return self._MATRIX_COLOR_MAP["off"]
+        return self._MATRIX_COLOR_MAP[color_name]
+
     def _initialize_neopixels(self, pin1, pin2):
         """Initializes the NeoPixel strips."""
         if self.config.get('NEOPIXEL_USE_OE_PIN', False):
@@ -175,6 +285,11 @@ class ParkingGuideDisplay:
             order = self.config.get('NEOPIXEL_PIXEL_ORDER', 'GRB')
             self.pixels1 = neopixel.NeoPixel(pin1, num_leds, pixel_order=order, auto_write=False)
             self.pixels2 = neopixel.NeoPixel(pin2, num_leds, pixel_order=order, auto_write=False)
+            self._neopixel_order = order
+            self._neopixel_num_leds = num_leds
+            # The palette is fixed, so every strip payload can be built up front
+            for rgb_color in self._NEOPIXEL_COLOR_MAP.values():
+                self._get_neopixel_payload(rgb_color)
             print("NeoPixel strips initialized.")
         except Exception as e:
             print(f"Error initializing NeoPixel strips: {e}")
@@ -200,6 +315,7 @@ class ParkingGuideDisplay:
                 i2c_bus.unlock()
 
         temp_matrices = []
+        temp_addresses = []
         possible_addrs = self.config.get('POSSIBLE_ADDRESSES', [])
         max_matrices = self.config.get('MAX_MATRICES', 4)
         brightness = self.config.get('BRIGHTNESS_LEVEL', 1.0)
@@ -213,30 +329,34 @@ class ParkingGuideDisplay:
                     matrix_instance.fill(self._MATRIX_COLOR_MAP["off"])
                     matrix_instance.show()
                     temp_matrices.append(matrix_instance)
+                    temp_addresses.append(addr)
                 except Exception as e:
                     print(f"Failed to initialize matrix at {hex(addr)}: {e}")
 
         self.matrices = temp_matrices
-        self.total_display_columns = len(self.matrices) * self.config.get('MATRIX_COLUMNS_PER_UNIT', 8)
+        self._matrix_addresses = temp_addresses
+        self._i2c_bus = i2c_bus
+        self.total_display_columns = len(self.matrices) * self._cols_per_unit
+        self._column_targets = tuple(
+            (m._buffer, 1 + 2 * col) for m in self.matrices for col in range(self._cols_per_unit)
+        )
+        self._column_colors = bytearray(self.total_display_columns)
+        self._flushed_colors = bytearray(self.total_display_columns)
+        self._matrices_dirty = True
+        self._matrices_blank = True # Each matrix was blanked as it was set up
+        self._sent_buffers = [bytearray(len(m._buffer)) for m in self.matrices]
+        self._flush_scratch = bytearray(len(self.matrices[0]._buffer) if self.matrices else 0)
+        # Countdown and score digits are known ahead of time, so build their frames now
+        if self.matrices:
+            for color_name in ("red", "green"):
+                for digit in self._digit_columns:
+                    self._get_digit_frame(digit, self._MATRIX_COLOR_MAP[color_name])
         print(f"Initialized {len(self.matrices)} matrices, total {self.total_display_columns} display columns.")
 
 
     # --- Private Calculation Helpers (Directly from original script) ---
 
-    def _calculate_current_tof_percentage(self, current_tof_reading_cm, upper_range_cm_config):
-        if current_tof_reading_cm < 0: return self.TOF_READING_ERROR
-        if current_tof_reading_cm > upper_range_cm_config: return self.TOF_READING_ERROR
-        if upper_range_cm_config == 0: return 0.0 if current_tof_reading_cm > 0 else 100.0
-        raw_percentage = ((upper_range_cm_config - current_tof_reading_cm) / upper_range_cm_config) * 100.0
-        return max(0.0, min(100.0, raw_percentage))
-
-    def _calculate_derived_target_percentage(self, parked_distance_cm_config, upper_range_cm_config):
-        if parked_distance_cm_config is None or not (0 <= parked_distance_cm_config <= upper_range_cm_config): return 50.0
-        if upper_range_cm_config == 0: return 0.0
-        raw_percentage = ((upper_range_cm_config - parked_distance_cm_config) / upper_range_cm_config) * 100.0
-        return max(0.0, min(100.0, raw_percentage))
-
-    def _get_pattern_display_details(self, current_slider_original_pct, is_phase2_active, derived_target_pct):
+    def _get_pattern_display_details(self, is_phase2_active, derived_target_pct):
         # This function remains complex, but is now fully encapsulated.
         cfg = self.config
         total_cols = self.total_display_columns
@@ -262,22 +382,14 @@ class ParkingGuideDisplay:
                 'phase2_view_coverage_pct': view_coverage_pct
             })
 
-            c_start, c_end = self._get_phase2_static_marker_details(derived_target_pct, derived_target_pct, effective_cols_per_pct, viewport_start_pct, view_coverage_pct, False, False, None)
-            pattern['center_display_col_start'], pattern['center_display_col_end'] = c_start, c_end
-            center_marker_details = {'start': c_start, 'end': c_end}
-
             # DYNAMIC MARKER CALCULATION
             offset_pct = cfg.get('CONFIG_PHASE2_STATIC_MARKER_OFFSET_PCT', 3.0)
-            left_pct = derived_target_pct - offset_pct
-            right_pct = derived_target_pct + offset_pct
-            
-            pattern['left_original_pct'] = left_pct
-            l_start, l_end = self._get_phase2_static_marker_details(left_pct, derived_target_pct, effective_cols_per_pct, viewport_start_pct, view_coverage_pct, True, False, center_marker_details)
-            pattern['left_display_col_start'], pattern['left_display_col_end'] = l_start, l_end
-            
-            pattern['right_original_pct'] = right_pct
-            r_start, r_end = self._get_phase2_static_marker_details(right_pct, derived_target_pct, effective_cols_per_pct, viewport_start_pct, view_coverage_pct, False, True, center_marker_details)
-            pattern['right_display_col_start'], pattern['right_display_col_end'] = r_start, r_end
+            pattern['left_original_pct'] = derived_target_pct - offset_pct
+            pattern['right_original_pct'] = derived_target_pct + offset_pct
+            (pattern['left_display_col_start'], pattern['left_display_col_end'],
+             pattern['center_display_col_start'], pattern['center_display_col_end'],
+             pattern['right_display_col_start'], pattern['right_display_col_end']) = self._get_phase2_marker_columns(
+                derived_target_pct, offset_pct, effective_cols_per_pct, viewport_start_pct, view_coverage_pct)
         else:
             # Phase 1 "Overview" calculations
             center_col = min(total_cols - 1, max(0, int((derived_target_pct / 100.0) * total_cols)))
@@ -298,148 +410,339 @@ class ParkingGuideDisplay:
                 pattern['original_pct_per_display_col'] = 100.0 / total_cols
         return pattern
 
-    def _get_phase2_static_marker_details(self, static_marker_pct, target_pct, cols_per_pct, viewport_start_pct, view_coverage_pct, is_left, is_right, center_details):
-        # This helper remains mostly unchanged, using instance properties for calculations.
+    def _refresh_target_cache(self, target_distance_cm):
+        """
+        Recomputes the values that only depend on the target and the number of columns,
+        so per-frame work is limited to the slider position itself.
+        :param target_distance_cm: The desired 'parked' distance.
+        """
+        # Compared field by field so the per-frame check doesn't allocate a key tuple
+        if (self._pattern_cache_valid and target_distance_cm == self._pattern_target_cm
+                and self.total_display_columns == self._pattern_cols): return
+        self._pattern_cache_valid = True
+        self._pattern_target_cm = target_distance_cm
+        upper_range = self._upper_range_cm
+        if target_distance_cm is None or not (0 <= target_distance_cm <= upper_range):
+            derived_target_pct = 50.0
+        elif upper_range == 0:
+            derived_target_pct = 0.0
+        else:
+            derived_target_pct = ((upper_range - target_distance_cm) / upper_range) * 100.0
+            if derived_target_pct > 100.0: derived_target_pct = 100.0
+        self._pattern_target_pct = derived_target_pct
+        self._pattern_cols = self.total_display_columns
+        self._pattern_cache = [None, None]
+        zoom_config_pct = self.config.get('CONFIG_ZOOM_TRANSITION_THRESHOLD_PERCENT', 75.0)
+        self._zoom_threshold_pct = (zoom_config_pct / 100.0) * derived_target_pct
+        # The center marker sits on the target in both phases
+        self._p1_color_thresh_pct = self._calculate_phase1_slider_color_change_threshold(derived_target_pct, derived_target_pct)
+
+    def _get_cached_pattern_details(self, is_phase2_active, derived_target_pct):
+        """
+        Returns the pattern details for a phase, computing them once per target.
+        _refresh_target_cache() must have been called for this target first.
+        The returned dict is shared and must not be modified.
+        """
+        phase_idx = 1 if is_phase2_active else 0
+        pattern = self._pattern_cache[phase_idx]
+        if pattern is None:
+            pattern = self._get_pattern_display_details(is_phase2_active, derived_target_pct)
+            pattern['marker_overlay'] = self._build_marker_overlay(pattern, is_phase2_active)
+            # Original percentage at the start of each display column
+            vp_start = pattern['viewport_original_start_pct']
+            pct_per_col = pattern['original_pct_per_display_col']
+            pattern['col_start_pcts'] = [vp_start + (idx * pct_per_col) for idx in range(self.total_display_columns)]
+            # First column whose start reaches the Phase 1 color change threshold
+            pattern['color_split_col'] = self._count_cols_before(pattern['col_start_pcts'], self._p1_color_thresh_pct)
+            self._pattern_cache[phase_idx] = pattern
+        return pattern
+
+    def _build_marker_overlay(self, pattern, is_phase2_active):
+        """
+        Flattens the static markers of a pattern into one overlay value per column, so the
+        renderer can apply them in the same pass as the slider fill.
+        :return: A bytearray holding, per column, _NO_MARKER or a color code, which has
+                 _MARKER_IF_UNLIT set when it only replaces an unlit column.
+        """
         total_cols = self.total_display_columns
-        display_col_start, display_col_end = -1, -1
-        if total_cols == 0 or cols_per_pct <= 0: return -1, -1
+        off = self._off_code
+        center_only_fills_off = is_phase2_active and self.config['PHASE2_ALLOW_SLIDER_OVERWRITE_TARGET']
+        markers = (
+            ('left', pattern['left_display_col_start'], pattern['left_display_col_end'], self._left_code),
+            ('right', pattern['right_display_col_start'], pattern['right_display_col_end'], self._right_code),
+            ('center', pattern['center_display_col_start'], pattern['center_display_col_end'], self._center_code)
+        )
+        overlay = bytearray(bytes([_NO_MARKER]) * total_cols)
+        # Markers are layered in order, as if each were drawn over the ones before it
+        for name, start, end, code in markers:
+            if start == -1: continue
+            lo = max(0, start)
+            hi = min(total_cols, end + 1)
+            if lo >= hi: continue
+            if not (center_only_fills_off and name == 'center'):
+                overlay[lo:hi] = bytes([code]) * (hi - lo)
+                continue
+            # The Phase 2 center only replaces unlit columns, so it is layered column by column
+            for i in range(lo, hi):
+                below = overlay[i]
+                if below == _NO_MARKER:
+                    overlay[i] = code | _MARKER_IF_UNLIT
+                elif below == off:
+                    overlay[i] = code
+        return overlay
+
+    def _get_phase2_marker_columns(self, target_pct, marker_offset_pct, cols_per_pct, viewport_start_pct, view_coverage_pct):
+        """
+        Maps the three Phase 2 static markers onto display columns in one pass.
+        :return: (left_start, left_end, center_start, center_end, right_start, right_end), -1 for a hidden marker.
+        """
+        total_cols = self.total_display_columns
+        if total_cols == 0 or cols_per_pct <= 0: return -1, -1, -1, -1, -1, -1
 
         pct_per_col = 1.0 / cols_per_pct
-        num_cols_for_marker = max(1, int(cols_per_pct * 1.0))
-        
+        num_cols = max(1, int(cols_per_pct * 1.0))
+        last_col = total_cols - 1
         tolerance = self.config.get('FLOAT_COMPARISON_TOLERANCE', 0.0001)
-
-        if viewport_start_pct - tolerance <= static_marker_pct < viewport_start_pct + view_coverage_pct + tolerance:
-            offset_pct = static_marker_pct - viewport_start_pct
-            if is_left:
-                ideal_end = offset_pct / pct_per_col
-                display_col_end = int(ideal_end)
-                display_col_start = display_col_end - num_cols_for_marker + 1
-            elif is_right:
-                ideal_start = offset_pct / pct_per_col
-                display_col_start = int(ideal_start)
-                display_col_end = display_col_start + num_cols_for_marker - 1
-            else: # Center
-                ideal_center = offset_pct / pct_per_col
-                start_raw = ideal_center - (num_cols_for_marker / 2.0)
-                display_col_start = int(start_raw + self.config.get('ROUNDING_OFFSET', 0.5))
-                display_col_end = display_col_start + num_cols_for_marker - 1
-
-            display_col_start = max(0, display_col_start)
-            display_col_end = min(total_cols - 1, display_col_end)
-
-            if display_col_start > display_col_end: return -1, -1
-            if center_details and center_details['start'] != -1 and (is_left or is_right):
-                overlap = (display_col_start <= center_details['end']) and (display_col_end >= center_details['start'])
-                if overlap: return -1, -1
-        return display_col_start, display_col_end
+        view_lo = viewport_start_pct - tolerance
+        view_hi = viewport_start_pct + view_coverage_pct + tolerance
+
+        # Center marker: centred on the target, rounded to the nearest column
+        c_start = c_end = -1
+        if view_lo <= target_pct < view_hi:
+            ideal_center = (target_pct - viewport_start_pct) / pct_per_col
+            c_start = int(ideal_center - (num_cols / 2.0) + self.config.get('ROUNDING_OFFSET', 0.5))
+            c_end = min(last_col, c_start + num_cols - 1)
+            c_start = max(0, c_start)
+            if c_start > c_end: c_start = c_end = -1
+
+        # Left marker ends at, and right marker starts at, the column holding its offset.
+        # Either is hidden if it falls outside the viewport or overlaps the center marker.
+        l_start = l_end = -1
+        left_pct = target_pct - marker_offset_pct
+        if view_lo <= left_pct < view_hi:
+            l_end = int((left_pct - viewport_start_pct) / pct_per_col)
+            l_start = max(0, l_end - num_cols + 1)
+            l_end = min(last_col, l_end)
+            if l_start > l_end or (c_start != -1 and l_start <= c_end and l_end >= c_start):
+                l_start = l_end = -1
+
+        r_start = r_end = -1
+        right_pct = target_pct + marker_offset_pct
+        if view_lo <= right_pct < view_hi:
+            r_start = int((right_pct - viewport_start_pct) / pct_per_col)
+            r_end = min(last_col, r_start + num_cols - 1)
+            r_start = max(0, r_start)
+            if r_start > r_end or (c_start != -1 and r_start <= c_end and r_end >= c_start):
+                r_start = r_end = -1
+
+        return l_start, l_end, c_start, c_end, r_start, r_end
 
     # --- Private Rendering Methods ---
 
-    def _render_matrix_display(self, current_slider_pct, derived_target_pct, pattern_details):
-        """Internal method to draw the current state to the LED matrices."""
+    def _render_matrix_display(self, current_slider_pct, is_phase2, pattern_details, progress_color):
+        """
+        Internal method to draw the current state to the LED matrices.
+        :param progress_color: The current progress color name, used for the Phase 2 fill.
+        """
         total_cols = self.total_display_columns
         if total_cols == 0 or not pattern_details: return
 
-        cfg = self.config
-        
-        # DYNAMIC THRESHOLD: Use the same logic as the update() method to determine
-        # the current phase, ensuring consistency.
-        zoom_config_pct = cfg.get('CONFIG_ZOOM_TRANSITION_THRESHOLD_PERCENT', 75.0)
-        dynamic_zoom_threshold = (zoom_config_pct / 100.0) * derived_target_pct
-        is_phase2 = current_slider_pct >= dynamic_zoom_threshold
-        
-        colors = ["off"] * total_cols
-        
-        p1_color_thresh_pct = self._calculate_phase1_slider_color_change_threshold(pattern_details['center_original_pct'], derived_target_pct)
+        off = self._off_code
+        colors = self._column_colors
+
+        # Hoist per-frame constants out of the column loop
+        vp_start = pattern_details['viewport_original_start_pct']
+        pct_per_col = pattern_details['original_pct_per_display_col']
+        col_start_pcts = pattern_details['col_start_pcts']
 
+        # Reduce the slider to integer column boundaries: columns [0, fill_cols) are lit,
+        # using the start color below split_col and the end color from there on
+        if is_phase2:
+            # Zoomed: the whole filled run takes the current progress color
+            fill_cols = 0
+            if current_slider_pct > vp_start and pct_per_col > 0:
+                fill_cols = min(total_cols, int((current_slider_pct - vp_start) / pct_per_col))
+            split_col = 0
+            end_code = self._MATRIX_COLOR_MAP.get(progress_color, off)
+            start_code = end_code
+        else:
+            # Overview: a column is lit once its start is passed and turns to the end
+            # color once its start reaches the color change threshold
+            fill_cols = self._count_cols_before(col_start_pcts, current_slider_pct)
+            split_col = pattern_details['color_split_col']
+            start_code = self._slider_start_code
+            end_code = self._slider_end_code
+
+        # Write every column in a single pass: the slider fill, then any static marker over
+        # it. A marker flagged _MARKER_IF_UNLIT (the Phase 2 center) only fills unlit columns.
+        overlay = pattern_details['marker_overlay']
         for idx in range(total_cols):
-            col_start_pct = pattern_details['viewport_original_start_pct'] + (idx * pattern_details['original_pct_per_display_col'])
-            
-            is_filled = False
-            if is_phase2:
-                if current_slider_pct > pattern_details['viewport_original_start_pct'] and pattern_details['original_pct_per_display_col'] > 0:
-                    cols_to_fill = int((current_slider_pct - pattern_details['viewport_original_start_pct']) / pattern_details['original_pct_per_display_col'])
-                    if idx < cols_to_fill: is_filled = True
-            elif col_start_pct < current_slider_pct:
-                is_filled = True
-
-            if is_filled:
-                colors[idx] = self._get_slider_fill_color(current_slider_pct, col_start_pct, is_phase2, p1_color_thresh_pct, pattern_details)
-
-        # Apply static markers over the slider bar
-        markers = [
-            ('left', pattern_details['left_display_col_start'], pattern_details['left_display_col_end'], pattern_details['left_color']),
-            ('right', pattern_details['right_display_col_start'], pattern_details['right_display_col_end'], pattern_details['right_color']),
-            ('center', pattern_details['center_display_col_start'], pattern_details['center_display_col_end'], pattern_details['center_color'])
-        ]
-        for name, start, end, color in markers:
-            if start != -1:
-                for i in range(start, end + 1):
-                    if 0 <= i < total_cols:
-                        if name == 'center' and is_phase2 and cfg['PHASE2_ALLOW_SLIDER_OVERWRITE_TARGET']:
-                            if colors[i] == "off": colors[i] = color
-                        else:
-                            colors[i] = color
+            if idx >= fill_cols:
+                code = off
+            elif idx < split_col:
+                code = start_code
+            else:
+                code = end_code
+            marker = overlay[idx]
+            if marker != _NO_MARKER:
+                if not marker & _MARKER_IF_UNLIT:
+                    code = marker
+                elif code == off:
+                    code = marker & ~_MARKER_IF_UNLIT
+            colors[idx] = code
 
         # Apply precise indicator in Phase 2
-        if is_phase2 and cfg['PHASE2_SHOW_PRECISE_INDICATOR']:
-            if pattern_details['original_pct_per_display_col'] > 0:
-                progress_into_vp = current_slider_pct - pattern_details['viewport_original_start_pct']
-                indicator_idx = int(progress_into_vp / pattern_details['original_pct_per_display_col'])
+        if is_phase2 and self._show_precise_indicator:
+            if pct_per_col > 0:
+                indicator_idx = int((current_slider_pct - vp_start) / pct_per_col)
                 if 0 <= indicator_idx < total_cols:
-                    colors[indicator_idx] = cfg['CONFIG_PRECISE_INDICATOR_COLOR']
+                    colors[indicator_idx] = self._indicator_code
 
-        # Draw to hardware
-        for i, color_name in enumerate(colors):
-            self._set_single_column_color(i, color_name)
-        
+        # Nothing moved since the last frame, so leave the I2C bus alone
+        flushed = self._flushed_colors
+        if not self._matrices_dirty and colors == flushed:
+            return
+        resend_all = self._matrices_dirty
+        self._matrices_dirty = False
+        self._matrices_blank = False
+
+        # Draw straight into each matrix's framebuffer: a column is one byte in the
+        # green plane and one in the red plane, so no per-pixel driver calls are needed.
+        # A clean framebuffer already holds the last frame, so only changed columns are rewritten
+        green_bits = self._GREEN_BITS
+        red_bits = self._RED_BITS
+        column_targets = self._column_targets
+        for idx in range(total_cols):
+            code = colors[idx]
+            if resend_all or code != flushed[idx]:
+                buf, green_idx = column_targets[idx]
+                buf[green_idx] = green_bits[code]
+                buf[green_idx + 1] = red_bits[code]
+                flushed[idx] = code
+
+        self._flush_matrices(resend_all)
+
+    def _count_cols_before(self, col_start_pcts, pct):
+        """Returns how many columns start below pct; the start percentages are in ascending order."""
+        count = 0
+        total_cols = len(col_start_pcts)
+        while count < total_cols and col_start_pcts[count] < pct:
+            count += 1
+        return count
+
+    def _clear_matrices(self):
+        """Turns off every matrix LED, skipping the bus if they are already blank."""
+        self._matrices_dirty = True
+        self._last_update_valid = False
+        if self.matrices and not self._matrices_blank:
+            self._blank_framebuffers()
+            # A failed write leaves the flag unset, so the next clear tries again
+            self._matrices_blank = self._flush_matrices(True)
+
+    def _blank_framebuffers(self):
+        """Turns off every LED in the matrix framebuffers without sending them."""
+        # Byte 0 of each framebuffer is the HT16K33 RAM start address, not pixel data
         for m in self.matrices:
-            try:
-                m.show()
-            except OSError as e:
-                print(f"I2C Error on matrix {hex(m.address)} during show(): {e}")
+            buf = m._buffer
+            for i in range(1, len(buf)):
+                buf[i] = 0
+
+    def _flush_matrices(self, resend_all):
+        """
+        Writes the matrix framebuffers out in a single bus lock, one transaction per matrix,
+        skipping matrices whose framebuffer is unchanged since it was last sent and otherwise
+        sending only the bytes that changed.
+        :param resend_all: Send every matrix, e.g. after something else drew on them.
+        :return: True if every write succeeded.
+        """
+        bus = self._i2c_bus
+        scratch = self._flush_scratch
+        ok = True
+        while not bus.try_lock():
+            pass
+        try:
+            for addr, m, sent in zip(self._matrix_addresses, self.matrices, self._sent_buffers):
+                buf = m._buffer
+                try:
+                    if resend_all:
+                        bus.writeto(addr, buf)
+                        sent[:] = buf
+                        continue
+                    if buf == sent:
+                        continue
+                    # The HT16K33 auto-increments its RAM address, so only the span from the
+                    # first to the last changed byte is sent, prefixed with its start address.
+                    # Byte 0 of the framebuffer is the address command, so RAM byte i is buf[i + 1].
+                    hi = len(buf) - 1
+                    lo = 1
+                    while lo <= hi and buf[lo] == sent[lo]:
+                        lo += 1
+                    if lo > hi:
+                        continue
+                    while buf[hi] == sent[hi]:
+                        hi -= 1
+                    scratch[0] = lo - 1
+                    for i in range(lo, hi + 1):
+                        scratch[i - lo + 1] = buf[i]
+                    bus.writeto(addr, scratch, end=hi - lo + 2)
+                    for i in range(lo, hi + 1):
+                        sent[i] = buf[i]
+                except OSError as e:
+                    print(f"I2C Error on matrix {hex(addr)} during show(): {e}")
+                    self._matrices_dirty = True
+                    self._last_update_valid = False
+                    ok = False
+        finally:
+            bus.unlock()
+        return ok
 
-    def _update_neopixel_strips(self, current_slider_pct, is_phase2, is_error, pattern_details, derived_target_pct):
+    def _update_neopixel_strips(self, progress_color, is_error):
         """Internal method to update the NeoPixel strips based on the current state."""
         if is_error:
-            self._set_neopixel_color("blue")
+            self._set_neopixel_rgb(self._NEOPIXEL_COLOR_MAP["blue"])
             return
-            
-        p1_color_thresh = self._calculate_phase1_slider_color_change_threshold(pattern_details['center_original_pct'], derived_target_pct)
-        
-        current_color = self._get_current_progress_color(current_slider_pct, is_phase2, p1_color_thresh, pattern_details)
-        self._set_neopixel_color(current_color)
 
-    def _set_single_column_color(self, global_col_idx, color_name):
-        """Sets all LEDs in a globally indexed column to a specified color."""
-        if not (0 <= global_col_idx < self.total_display_columns): return
-
-        color_val = self._MATRIX_COLOR_MAP.get(color_name, self._MATRIX_COLOR_MAP["off"])
-        matrix_idx = global_col_idx // self.config['MATRIX_COLUMNS_PER_UNIT']
-        col_in_matrix = global_col_idx % self.config['MATRIX_COLUMNS_PER_UNIT']
-        
-        if 0 <= matrix_idx < len(self.matrices):
-            matrix_obj = self.matrices[matrix_idx]
-            for row in range(8):
-                try:
-                    matrix_obj[col_in_matrix, row] = color_val
-                except IndexError:
-                    pass # Should not happen with guards, but for safety
+        self._set_neopixel_color(progress_color)
 
     def _set_neopixel_color(self, color_name):
         """Sets both NeoPixel strips to a specified color."""
+        self._set_neopixel_rgb(self._NEOPIXEL_COLOR_MAP.get(color_name, self._NEOPIXEL_COLOR_MAP["off"]))
+
+    def _set_neopixel_rgb(self, rgb_color):
+        """
+        Sets both NeoPixel strips to an RGB tuple, skipping the write if they already show it.
+        Both strips show the same color, so one prebuilt wire-order payload is sent to each pin
+        with neopixel_write, bypassing the NeoPixel objects (brightness is always full).
+        :param rgb_color: The (r, g, b) tuple to show.
+        """
         if not self.pixels1 or not self.pixels2: return
-        
-        rgb_color = self._NEOPIXEL_COLOR_MAP.get(color_name, self._NEOPIXEL_COLOR_MAP["off"])
+        if rgb_color == self._neopixel_rgb: return
+
         try:
-            self.pixels1.fill(rgb_color)
-            self.pixels2.fill(rgb_color)
-            self.pixels1.show()
-            self.pixels2.show()
+            buf = self._get_neopixel_payload(rgb_color)
+            neopixel_write(self.pixels1.pin, buf)
+            neopixel_write(self.pixels2.pin, buf)
+            self._neopixel_rgb = rgb_color
         except Exception as e:
+            self._neopixel_rgb = None
+            # Like a failed matrix write, make the next update() redraw even if its inputs repeat
+            self._last_update_valid = False
             print(f"Error updating NeoPixels: {e}")
             
+    def _get_neopixel_payload(self, rgb_color):
+        """
+        Returns the wire-order bytes for a whole strip of one color, building them on first use.
+        :param rgb_color: The (r, g, b) tuple to show.
+        """
+        payload = self._neopixel_payloads.get(rgb_color)
+        if payload is None:
+            r, g, b = rgb_color
+            channels = {'R': r, 'G': g, 'B': b}
+            pixel = bytes([channels.get(ch, 0) for ch in self._neopixel_order])
+            payload = pixel * self._neopixel_num_leds
+            self._neopixel_payloads[rgb_color] = payload
+        return payload
+
     # --- Private Color Logic Helpers ---
     
     def _calculate_phase1_slider_color_change_threshold(self, center_marker_pct, derived_target_pct):
@@ -454,19 +757,10 @@ class ParkingGuideDisplay:
         return (50.0 / 100.0) * derived_target_pct
 
     def _get_current_progress_color(self, current_slider_pct, is_phase2, p1_color_thresh_pct, pattern_details):
-        cfg = self.config
         if is_phase2:
-            initial_color = cfg['CONFIG_SLIDER_END_COLOR_PHASE1'] if current_slider_pct >= p1_color_thresh_pct else cfg['CONFIG_SLIDER_START_COLOR']
-            first_static_pct = pattern_details.get('left_original_pct', -1.0)
+            first_static_pct = pattern_details['left_original_pct']
             if first_static_pct != -1.0 and current_slider_pct > first_static_pct:
-                return cfg['CONFIG_SLIDER_COLOR_AFTER_1ST_STATIC_ZOOMED']
-            return initial_color
-        else:
-            return cfg['CONFIG_SLIDER_END_COLOR_PHASE1'] if current_slider_pct > p1_color_thresh_pct else cfg['CONFIG_SLIDER_START_COLOR']
-
-    def _get_slider_fill_color(self, current_slider_pct, col_start_pct, is_phase2, p1_color_thresh_pct, pattern_details):
-        cfg = self.config
-        if is_phase2:
-            return self._get_current_progress_color(current_slider_pct, is_phase2, p1_color_thresh_pct, pattern_details)
+                return self._after_1st_static_color
+            return self._slider_end_color if current_slider_pct >= p1_color_thresh_pct else self._slider_start_color
         else:
-            return cfg['CONFIG_SLIDER_END_COLOR_PHASE1'] if col_start_pct >= p1_color_thresh_pct else cfg['CONFIG_SLIDER_START_COLOR']
+            return self._slider_end_color if current_slider_pct > p1_color_thresh_pct else self._slider_start_color
@@ -0,0 +1,159 @@
+"""
+Host-side checks for the Sensors class in code.py.
+
+code.py targets CircuitPython, so the board modules it imports are replaced with
+small fakes before it is loaded. Run with: python -m unittest discover tests
+"""
+import importlib.util
+import os
+import sys
+import types
+import unittest
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _FakeEvent:
+    def __init__(self):
+        self.pressed = False
+
+
+class _FakeEventQueue:
+    def __init__(self):
+        self._events = []
+
+    def put(self, pressed):
+        self._events.append(pressed)
+
+    def get_into(self, event):
+        if not self._events:
+            return False
+        event.pressed = self._events.pop(0)
+        return True
+
+    def clear(self):
+        self._events = []
+
+
+class _FakeKeys:
+    """Models keypad.Keys for one pin: queues a press or release on each level change."""
+
+    def __init__(self, pins, value_when_pressed, pull=True):
+        self.pins = pins
+        self.value_when_pressed = value_when_pressed
+        self.events = _FakeEventQueue()
+        self.level = not value_when_pressed if pull else False
+
+    def drive(self, level):
+        if level != self.level:
+            self.level = level
+            self.events.put(level == self.value_when_pressed)
+
+
+class _FakeVL53L1X:
+    """GPIO1 is active high, as set by the driver's init sequence."""
+
+    interrupt_polarity = 1
+
+    def __init__(self, i2c_bus):
+        self.gpio1 = None
+        self.data_ready = False
+        self.range_mm = 1234
+
+    def start_ranging(self):
+        pass
+
+    def stop_ranging(self):
+        pass
+
+    def clear_interrupt(self):
+        self.data_ready = False
+        if self.gpio1 is not None:
+            self.gpio1.drive(not self.interrupt_polarity)
+
+    def sample_ready(self):
+        self.data_ready = True
+        if self.gpio1 is not None:
+            self.gpio1.drive(bool(self.interrupt_polarity))
+
+    def read_range_and_status_mm(self):
+        # Like the driver, reading a result clears the interrupt
+        self.clear_interrupt()
+        return self.range_mm
+
+
+def _load_code_module():
+    fakes = {
+        'board': types.SimpleNamespace(GP17='GP17'),
+        'busio': types.ModuleType('busio'),
+        'storage': types.ModuleType('storage'),
+        'supervisor': types.ModuleType('supervisor'),
+        'keypad': types.SimpleNamespace(Keys=_FakeKeys, Event=_FakeEvent),
+        'adafruit_vl53l1x': types.SimpleNamespace(VL53L1X=_FakeVL53L1X),
+        'adafruit_bh1750': types.SimpleNamespace(BH1750=lambda i2c_bus: None),
+        'parking_guide_display': types.SimpleNamespace(ParkingGuideDisplay=None),
+    }
+    saved = {name: sys.modules.get(name) for name in fakes}
+    sys.modules.update(fakes)
+    try:
+        spec = importlib.util.spec_from_file_location('parking_code', os.path.join(_REPO_DIR, 'code.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        for name, original in saved.items():
+            if original is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = original
+    return module
+
+
+class GetDistanceTest(unittest.TestCase):
+    """get_distance() is called at least one timing budget apart, as the main loop does."""
+
+    def _make_sensors(self, tof_int_pin):
+        code = _load_code_module()
+        sensors = code.Sensors(None, button_pin='GP15', tof_int_pin=tof_int_pin)
+        tof = sensors.tof_sensor
+        tof.gpio1 = sensors._tof_int_keys
+        sensors.start_ranging()
+        return sensors, tof
+
+    def test_polls_the_sensor_by_default(self):
+        sensors, tof = self._make_sensors(None)
+        self.assertIsNone(sensors._tof_int_keys)
+        self.assertIsNone(sensors.get_distance(now=1.0))
+        tof.sample_ready()
+        self.assertEqual(sensors.get_distance(now=2.0), 123.4)
+        self.assertTrue(sensors.tof_sample_fresh)
+        self.assertIsNone(sensors.get_distance(now=3.0))
+        self.assertFalse(sensors.tof_sample_fresh)
+
+    def test_first_sample_after_start_is_seen(self):
+        sensors, tof = self._make_sensors('GP14')
+        self.assertIsNone(sensors.get_distance(now=1.0))
+        tof.sample_ready()
+        self.assertEqual(sensors.get_distance(now=2.0), 123.4)
+        self.assertTrue(sensors.tof_sample_fresh)
+
+    def test_clearing_the_interrupt_is_not_a_new_sample(self):
+        sensors, tof = self._make_sensors('GP14')
+        tof.sample_ready()
+        self.assertEqual(sensors.get_distance(now=1.0), 123.4)
+        # The read above cleared the interrupt, dropping GPIO1 again
+        self.assertIsNone(sensors.get_distance(now=2.0))
+        self.assertFalse(sensors.tof_sample_fresh)
+        tof.range_mm = 567
+        tof.sample_ready()
+        self.assertEqual(sensors.get_distance(now=3.0), 56.7)
+
+    def test_start_ranging_drops_stale_edges(self):
+        sensors, tof = self._make_sensors('GP14')
+        sensors.stop_ranging()
+        tof.sample_ready()
+        sensors.start_ranging()
+        self.assertIsNone(sensors.get_distance(now=1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()